@@ -1,108 +1,185 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, List
+from fastapi.responses import ORJSONResponse, Response
+import msgspec
+from typing import Any, Dict, Optional, List, Tuple, Type
+from collections import OrderedDict
+from functools import lru_cache
+from importlib.util import find_spec
+import asyncio
 import logging
-import json
+import orjson
+import re
 import base64
-from datetime import datetime
+import hashlib
 import tempfile
 import os
+import io
+import wave
 
-try:
-    import whisper
-    import numpy as np
-    from gtts import gTTS
-    import pygame
-
-    VOICE_AVAILABLE = True
-except ImportError:
-    VOICE_AVAILABLE = False
-    logging.warning("Voice dependencies not installed. Voice features will be disabled.")
-
+from smart_home.config.app_config import my_config
 from smart_home.core.assistant import SmartHomeAssistant
 
-# Setup logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Setup logging (LOG_LEVEL=DEBUG turns on the verbose request logs)
+logging.basicConfig(
+    level=getattr(logging, my_config.log_level.upper(), logging.INFO),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
 logger = logging.getLogger(__name__)
 
+# Only probe for the voice stack here - Whisper and gTTS are imported on first use
+# Prefer the CTranslate2 backend (int8, 4-10x faster), fall back to openai-whisper
+FASTER_WHISPER = find_spec("faster_whisper") is not None
+if not my_config.enable_voice:
+    VOICE_AVAILABLE = False
+    logger.info("Voice features disabled by ENABLE_VOICE")
+else:
+    VOICE_AVAILABLE = (
+        find_spec("numpy") is not None
+        and find_spec("gtts") is not None
+        and (FASTER_WHISPER or find_spec("whisper") is not None)
+    )
+    if not VOICE_AVAILABLE:
+        logger.warning("Voice dependencies not installed. Voice features will be disabled.")
+
 # Create FastAPI app
 app = FastAPI(
     title="Smart Home Assistant API with Voice Support",
     description="Multilingual Smart Home Control API with Voice Interface",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
-# Enhanced CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# CORS for the browser UI - explicit methods/headers keep preflight checks cheap,
+# and same-origin deployments (CORS_ORIGINS empty) skip the middleware entirely
+if my_config.cors_origins:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=my_config.cors_origins,
+        allow_credentials=True,
+        allow_methods=["GET", "POST"],
+        allow_headers=["content-type", "authorization"],
+    )
 
 # Initialize assistant and voice components
 try:
     assistant = SmartHomeAssistant()
     logger.info("✅ Smart Home Assistant initialized")
 except Exception as e:
-    logger.error(f"❌ Failed to initialize assistant: {e}")
+    logger.error("❌ Failed to initialize assistant: %s", e)
     assistant = None
 
-# Initialize voice recognition if available
-whisper_model = None
-if VOICE_AVAILABLE:
-    try:
-        logger.info("🎤 Loading Whisper model for voice recognition...")
-        whisper_model = whisper.load_model("base")
-        pygame.mixer.init()
-        logger.info("✅ Voice components initialized")
-    except Exception as e:
-        logger.error(f"❌ Failed to initialize voice components: {e}")
-        VOICE_AVAILABLE = False
+WHISPER_SAMPLE_RATE = 16000
+WHISPER_WINDOW_SAMPLES = 30 * WHISPER_SAMPLE_RATE  # one Whisper input window
+
+
+@lru_cache(maxsize=1)
+def get_whisper_model():
+    """Load the Whisper model on the first voice request and keep it for the process lifetime"""
+    logger.info("🎤 Loading Whisper model for voice recognition...")
+    if FASTER_WHISPER:
+        import ctranslate2
+        from faster_whisper import WhisperModel
+
+        whisper_device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        model = WhisperModel(
+            "base",
+            device=whisper_device,
+            compute_type="int8_float16" if whisper_device == "cuda" else "int8"
+        )
+    else:
+        import whisper
+
+        # openai-whisper picks CUDA on its own and transcribes in fp16 there
+        model = whisper.load_model("base")
+    logger.info("✅ Whisper model loaded")
+    return model
+
+
+def is_whisper_loaded() -> bool:
+    """Check whether the Whisper model has been loaded yet"""
+    return get_whisper_model.cache_info().currsize > 0
 
 
 # Request/Response models
-class CommandRequest(BaseModel):
+class CommandRequest(msgspec.Struct):
     command: str
     language: Optional[str] = "auto"
     voice_enabled: Optional[bool] = False
 
 
-class CommandResponse(BaseModel):
+class CommandResponse(msgspec.Struct):
     response: str
     success: bool
     language_detected: Optional[str] = None
-    audio_base64: Optional[str] = None
+    audio_url: Optional[str] = None
 
 
-class VoiceCommandRequest(BaseModel):
+class VoiceCommandRequest(msgspec.Struct):
     audio_base64: str
     language: Optional[str] = "auto"
 
 
-class VoiceStatus(BaseModel):
+class VoiceStatus(msgspec.Struct):
     voice_available: bool
     whisper_loaded: bool
     tts_available: bool
     supported_languages: List[str]
 
 
+class MsgspecResponse(Response):
+    """Encode a msgspec struct straight to JSON bytes"""
+    media_type = "application/json"
+
+    def render(self, content: msgspec.Struct) -> bytes:
+        return msgspec.json.encode(content)
+
+
+def _schema(struct_type: Type[msgspec.Struct]) -> Dict[str, Any]:
+    """JSON schema of a struct, for documenting msgspec routes in OpenAPI"""
+    _, components = msgspec.json.schema_components((struct_type,))
+    return components[struct_type.__name__]
+
+
+def _json_body(struct_type: Type[msgspec.Struct]) -> Dict[str, Any]:
+    """OpenAPI request body for a route that decodes its own msgspec body"""
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": _schema(struct_type)}}}}
+
+
+async def decode_body(request: Request, struct_type: Type[msgspec.Struct]):
+    """Decode and validate a JSON request body into a msgspec struct"""
+    try:
+        return msgspec.json.decode(await request.body(), type=struct_type)
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@lru_cache(maxsize=1024)
+def _is_persian(text: str) -> bool:
+    """Detect Persian text (cached per unique string, commands repeat a lot)"""
+    return assistant is not None and assistant.persian_service.is_persian(text)
+
+
+# TTS text cleaning patterns
+_RE_STRIP = re.compile(r'[^\w\s\u0600-\u06FF.,!?()-]')
+_RE_WS = re.compile(r'\s+')
+_RE_TEMP = re.compile(r'(\d+)°[CF]')
+_RE_PCT = re.compile(r'(\d+)%')
+
+
 # Helper functions
 def clean_text_for_tts(text: str, is_persian: bool = False) -> str:
     """Clean text for TTS synthesis"""
-    import re
-
     # Remove emojis and special characters
-    text = re.sub(r'[^\w\s\u0600-\u06FF.,!?()-]', ' ', text)
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _RE_STRIP.sub(' ', text)
+    text = _RE_WS.sub(' ', text).strip()
 
     # Convert temperatures
-    text = re.sub(r'(\d+)°[CF]', r'\1 degrees', text)
+    text = _RE_TEMP.sub(r'\1 degrees', text)
 
     # Convert percentages
-    text = re.sub(r'(\d+)%', r'\1 percent', text)
+    text = _RE_PCT.sub(r'\1 percent', text)
 
     if not text.endswith(('.', '!', '?')):
         text += '.'
@@ -110,84 +187,257 @@ def clean_text_for_tts(text: str, is_persian: bool = False) -> str:
     return text
 
 
+def _pcm16_wav_to_array(audio_data: bytes) -> Optional["np.ndarray"]:
+    """Decode a 16 kHz mono PCM16 WAV straight into Whisper's float32 input format"""
+    try:
+        with wave.open(io.BytesIO(audio_data), "rb") as wav:
+            if (wav.getnchannels() != 1 or wav.getsampwidth() != 2
+                    or wav.getframerate() != WHISPER_SAMPLE_RATE):
+                return None
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError):
+        return None
+
+    import numpy as np
+
+    return np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def _run_whisper(audio) -> str:
+    """Run the Whisper backend on a float32 array, file path or file object"""
+    whisper_model = get_whisper_model()
+    if FASTER_WHISPER:
+        segments, _ = whisper_model.transcribe(audio, beam_size=1)
+        return "".join(segment.text for segment in segments).strip()
+
+    result = whisper_model.transcribe(audio, language=None)
+    return result["text"].strip()
+
+
+def transcribe_audio(audio_data: bytes) -> str:
+    """Transcribe audio bytes with Whisper (blocking - run it in the threadpool)"""
+    audio = _pcm16_wav_to_array(audio_data)
+    if audio is not None:
+        return _run_whisper(audio)
+
+    # faster-whisper decodes any format from memory via PyAV
+    if FASTER_WHISPER:
+        return _run_whisper(io.BytesIO(audio_data))
+
+    # openai-whisper decodes other formats with ffmpeg, which needs a file
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_file:
+        temp_file.write(audio_data)
+        temp_file_path = temp_file.name
+
+    try:
+        return _run_whisper(temp_file_path)
+    finally:
+        if os.path.exists(temp_file_path):
+            os.unlink(temp_file_path)
+
+
+def _decode_batch(audios: List["np.ndarray"]) -> List[Optional[str]]:
+    """Decode several clips (up to 30 s each) in one batched openai-whisper forward pass
+
+    A clip whose greedy decode transcribe() would have retried at a higher temperature comes
+    back as None, so the caller can run it through transcribe() and get the same transcript.
+    """
+    import torch
+    import whisper
+
+    model = get_whisper_model()
+    mel = torch.stack([
+        whisper.log_mel_spectrogram(whisper.pad_or_trim(torch.from_numpy(audio)), model.dims.n_mels)
+        for audio in audios
+    ]).to(model.device)
+
+    options = whisper.DecodingOptions(temperature=0.0, fp16=model.device.type == "cuda")
+    return [
+        None if result.compression_ratio > 2.4 or result.avg_logprob < -1.0 else result.text.strip()
+        for result in whisper.decode(model, mel, options)
+    ]
+
+
+def transcribe_batch(clips: List[bytes]) -> List[str]:
+    """Transcribe several audio clips, sharing one Whisper pass where the backend allows it"""
+    # faster-whisper has no cross-request batching (its requests bypass the batcher)
+    if len(clips) == 1 or FASTER_WHISPER:
+        return [transcribe_audio(clip) for clip in clips]
+
+    arrays = [_pcm16_wav_to_array(clip) for clip in clips]
+    # pad_or_trim would cut longer clips, those get transcribe()'s sliding window instead
+    batchable = [i for i, audio in enumerate(arrays) if audio is not None and len(audio) <= WHISPER_WINDOW_SAMPLES]
+
+    transcripts: List[Optional[str]] = [None] * len(clips)
+    if len(batchable) > 1:
+        for i, text in zip(batchable, _decode_batch([arrays[i] for i in batchable])):
+            transcripts[i] = text
+
+    # Long clips, ffmpeg-decoded ones and those needing a temperature fallback go through the regular path
+    return [text if text is not None else transcribe_audio(clip) for text, clip in zip(transcripts, clips)]
+
+
+TRANSCRIBE_BATCH_WINDOW = 0.02  # seconds to wait for more clips after the first one
+TRANSCRIBE_MAX_BATCH = 8
+
+
+class TranscriptionBatcher:
+    """Collect voice commands that arrive close together and transcribe them as one batch"""
+
+    def __init__(self, window: float = TRANSCRIBE_BATCH_WINDOW, max_batch: int = TRANSCRIBE_MAX_BATCH):
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def transcribe(self, audio_data: bytes) -> str:
+        """Queue audio for the next batch and wait for its transcript"""
+        # Start the drain task on first use, and again if it ever stopped
+        if self._task is None or self._task.done():
+            if self._queue is None:
+                self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._drain())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((audio_data, future))
+        return await future
+
+    async def _drain(self):
+        """Gather clips for one window, transcribe them off the event loop, fan out the results"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                transcripts = await run_in_threadpool(transcribe_batch, [audio for audio, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), transcript in zip(batch, transcripts):
+                if not future.done():
+                    future.set_result(transcript)
+
+
+transcription_batcher = TranscriptionBatcher()
+
+
+# Synthesized MP3 clips served by /api/voice/audio/{audio_id}, oldest evicted first
+AUDIO_CACHE_SIZE = 256
+_audio_clips: "OrderedDict[str, bytes]" = OrderedDict()
+
+
+def synthesize_speech(text: str, lang: str) -> bytes:
+    """Synthesize MP3 speech in memory"""
+    from gtts import gTTS
+
+    buffer = io.BytesIO()
+    gTTS(text=text, lang=lang, slow=False).write_to_fp(buffer)
+    return buffer.getvalue()
+
+
 async def generate_audio_response(text: str, language: str = "en") -> Optional[str]:
-    """Generate audio response using TTS"""
+    """Generate audio response using TTS and return the URL it is served from"""
     if not VOICE_AVAILABLE:
         return None
 
     try:
         # Clean text for TTS
-        is_persian = language == "fa" or (assistant and assistant.persian_service.is_persian(text))
+        is_persian = language == "fa" or _is_persian(text)
         clean_text = clean_text_for_tts(text, is_persian)
 
         if not clean_text.strip():
             return None
 
-        # Generate TTS
+        # Generate TTS (network round-trip to Google, keep it off the event loop)
         lang_code = 'fa' if is_persian else 'en'
-        tts = gTTS(text=clean_text, lang=lang_code, slow=False)
-
-        # Save to temporary file and encode to base64
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_file:
-            tts.save(temp_file.name)
+        audio_id = hashlib.sha1(f"{lang_code}:{clean_text}".encode("utf-8")).hexdigest()
 
-            with open(temp_file.name, "rb") as audio_file:
-                audio_data = audio_file.read()
-                audio_base64 = base64.b64encode(audio_data).decode()
+        if audio_id in _audio_clips:
+            _audio_clips.move_to_end(audio_id)
+        else:
+            _audio_clips[audio_id] = await run_in_threadpool(synthesize_speech, clean_text, lang_code)
+            while len(_audio_clips) > AUDIO_CACHE_SIZE:
+                _audio_clips.popitem(last=False)
 
-            # Clean up
-            os.unlink(temp_file.name)
-
-            return audio_base64
+        return f"/api/voice/audio/{audio_id}"
 
     except Exception as e:
-        logger.error(f"Error generating audio response: {e}")
+        logger.error("Error generating audio response: %s", e)
         return None
 
 
+_DEVICE_KEYWORDS = ['turn', 'set', 'روشن', 'خاموش', 'تنظیم', 'lamp', 'چراغ', 'ac', 'کولر', 'tv', 'تلویزیون']
+_DEVICE_COMMAND_RE = re.compile('|'.join(map(re.escape, _DEVICE_KEYWORDS)), re.IGNORECASE)
+
+
 def is_device_command(command: str) -> bool:
     """Check if command is device-related"""
-    device_keywords = ['turn', 'set', 'روشن', 'خاموش', 'تنظیم', 'lamp', 'چراغ', 'ac', 'کولر', 'tv', 'تلویزیون']
-    return any(keyword in command.lower() for keyword in device_keywords)
+    return _DEVICE_COMMAND_RE.search(command) is not None
 
 
 # API Routes
 @app.get("/")
 async def root():
     """Health check with voice capability info"""
-    return {
+    return ORJSONResponse({
         "message": "Smart Home Assistant API with Voice Support",
         "status": "running",
         "assistant_ready": assistant is not None,
         "voice_available": VOICE_AVAILABLE,
-        "whisper_loaded": whisper_model is not None,
+        "whisper_loaded": is_whisper_loaded(),
         "version": "2.0.0",
         "websocket_support": False
-    }
+    })
 
 
-@app.get("/api/voice/status", response_model=VoiceStatus)
-async def get_voice_status():
+_COMMAND_RESPONSE_DOC = {200: {"content": {"application/json": {"schema": _schema(CommandResponse)}}}}
+
+
+@app.get(
+    "/api/voice/status",
+    response_class=MsgspecResponse,
+    responses={200: {"content": {"application/json": {"schema": _schema(VoiceStatus)}}}}
+)
+async def get_voice_status() -> MsgspecResponse:
     """Get voice capabilities status"""
-    return VoiceStatus(
+    return MsgspecResponse(VoiceStatus(
         voice_available=VOICE_AVAILABLE,
-        whisper_loaded=whisper_model is not None,
+        whisper_loaded=is_whisper_loaded(),
         tts_available=VOICE_AVAILABLE,
         supported_languages=["en", "fa"] if VOICE_AVAILABLE else []
-    )
+    ))
 
 
-@app.post("/api/command", response_model=CommandResponse)
-async def process_command(request: CommandRequest):
+@app.post(
+    "/api/command",
+    response_class=MsgspecResponse,
+    responses=_COMMAND_RESPONSE_DOC,
+    openapi_extra=_json_body(CommandRequest)
+)
+async def process_command(http_request: Request) -> MsgspecResponse:
     """Process natural language command with optional voice response"""
     if not assistant:
         raise HTTPException(status_code=500, detail="Assistant not initialized")
 
+    request = await decode_body(http_request, CommandRequest)
+
     try:
-        logger.info(f"🎤 Received command: '{request.command}' (voice_enabled: {request.voice_enabled})")
+        logger.debug("🎤 Received command: '%s' (voice_enabled: %s)", request.command, request.voice_enabled)
 
-        # Process command with assistant
-        response = assistant.process_command(request.command)
+        # Process command with assistant (blocking LLM call, keep it off the event loop)
+        response = await run_in_threadpool(assistant.process_command, request.command)
 
         if response is None:
             response = "Assistant returned no response"
@@ -195,156 +445,168 @@ async def process_command(request: CommandRequest):
             response = "Assistant returned empty response"
 
         # Detect language
-        is_persian = assistant.persian_service.is_persian(request.command)
+        is_persian = _is_persian(request.command)
         detected_language = "persian" if is_persian else "english"
 
         # Generate audio response if requested and voice is available
-        audio_base64 = None
+        audio_url = None
         if request.voice_enabled and VOICE_AVAILABLE and response:
-            audio_base64 = await generate_audio_response(
+            audio_url = await generate_audio_response(
                 response,
                 "fa" if is_persian else "en"
             )
 
-        return CommandResponse(
+        command_response = CommandResponse(
             response=str(response),
             success=True,
             language_detected=detected_language,
-            audio_base64=audio_base64
+            audio_url=audio_url
         )
 
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Command response: %s", msgspec.json.encode(command_response).decode())
+
+        return MsgspecResponse(command_response)
+
     except Exception as e:
-        logger.error(f"❌ Error processing command: {e}")
-        import traceback
-        traceback.print_exc()
+        # Full traceback only when debugging
+        logger.error("❌ Error processing command: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
 
-        return CommandResponse(
+        return MsgspecResponse(CommandResponse(
             response=f"Error: {str(e)}",
             success=False
-        )
+        ))
 
 
-@app.post("/api/voice/command", response_model=CommandResponse)
-async def process_voice_command(request: VoiceCommandRequest):
+@app.post(
+    "/api/voice/command",
+    response_class=MsgspecResponse,
+    responses=_COMMAND_RESPONSE_DOC,
+    openapi_extra=_json_body(VoiceCommandRequest)
+)
+async def process_voice_command(http_request: Request) -> MsgspecResponse:
     """Process voice command from audio data"""
-    if not VOICE_AVAILABLE or not whisper_model:
+    if not VOICE_AVAILABLE:
         raise HTTPException(status_code=501, detail="Voice processing not available")
 
     if not assistant:
         raise HTTPException(status_code=500, detail="Assistant not initialized")
 
+    request = await decode_body(http_request, VoiceCommandRequest)
+
     try:
         logger.info("🎤 Processing voice command...")
 
         # Decode audio from base64
         audio_data = base64.b64decode(request.audio_base64)
 
-        # Save to temporary file for Whisper
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_file:
-            temp_file.write(audio_data)
-            temp_file_path = temp_file.name
-
-        try:
-            # Transcribe with Whisper
-            result = whisper_model.transcribe(temp_file_path, language=None)
-            transcript = result["text"].strip()
+        # Transcribe with Whisper off the event loop. faster-whisper can't batch across requests,
+        # so its calls run in parallel on the threadpool; openai-whisper batches concurrent clips
+        if FASTER_WHISPER:
+            transcript = await run_in_threadpool(transcribe_audio, audio_data)
+        else:
+            transcript = await transcription_batcher.transcribe(audio_data)
 
-            if not transcript:
-                return CommandResponse(
-                    response="I couldn't understand the audio. Please try again.",
-                    success=False
-                )
+        if not transcript:
+            return MsgspecResponse(CommandResponse(
+                response="I couldn't understand the audio. Please try again.",
+                success=False
+            ))
 
-            logger.info(f"📝 Transcribed: '{transcript}'")
+        logger.info("📝 Transcribed: '%s'", transcript)
 
-            # Process the transcribed command
-            response = assistant.process_command(transcript)
+        # Process the transcribed command
+        response = await run_in_threadpool(assistant.process_command, transcript)
 
-            if response is None:
-                response = "Command processed successfully"
-            elif response == "":
-                response = "Command completed"
-
-            # Detect language
-            is_persian = assistant.persian_service.is_persian(transcript)
-            detected_language = "persian" if is_persian else "english"
+        if response is None:
+            response = "Command processed successfully"
+        elif response == "":
+            response = "Command completed"
 
-            # Generate audio response
-            audio_base64 = await generate_audio_response(
-                response,
-                "fa" if is_persian else "en"
-            )
+        # Detect language
+        is_persian = _is_persian(transcript)
+        detected_language = "persian" if is_persian else "english"
 
-            return CommandResponse(
-                response=f"🎤 \"{transcript}\" → {response}",
-                success=True,
-                language_detected=detected_language,
-                audio_base64=audio_base64
-            )
+        # Generate audio response
+        audio_url = await generate_audio_response(
+            response,
+            "fa" if is_persian else "en"
+        )
 
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+        return MsgspecResponse(CommandResponse(
+            response=f"🎤 \"{transcript}\" → {response}",
+            success=True,
+            language_detected=detected_language,
+            audio_url=audio_url
+        ))
 
     except Exception as e:
-        logger.error(f"❌ Error processing voice command: {e}")
-        return CommandResponse(
+        logger.error("❌ Error processing voice command: %s", e)
+        return MsgspecResponse(CommandResponse(
             response=f"Error processing voice command: {str(e)}",
             success=False
-        )
+        ))
+
+
+@app.get("/api/voice/audio/{audio_id}", response_class=Response)
+async def get_voice_audio(audio_id: str):
+    """Serve a synthesized voice reply as raw MP3"""
+    audio = _audio_clips.get(audio_id)
+    if audio is None:
+        raise HTTPException(status_code=404, detail="Audio not found or expired")
+
+    return Response(content=audio, media_type="audio/mpeg", headers={"Cache-Control": "private, max-age=3600"})
+
+
+# Serialized /api/devices payload, keyed by the device manager's state version.
+# The boot id keeps ETags from matching across restarts (the version restarts at 0).
+_BOOT_ID = os.urandom(4).hex()
+_devices_cache: Optional[Tuple[int, bytes]] = None
 
 
 @app.get("/api/devices")
-async def get_all_devices():
+async def get_all_devices(request: Request):
     """Get status of all devices"""
+    global _devices_cache
+
     if not assistant:
         raise HTTPException(status_code=500, detail="Assistant not initialized")
 
     try:
-        logger.info("📱 Getting all devices...")
-        all_devices = assistant.device_manager.get_all_devices()
-
-        devices = {"lamps": [], "acs": [], "tvs": []}
-
-        for device_id, device in all_devices.items():
-            device_info = {
-                "id": device_id,
-                "name": device.name,
-                "location": device.location,
-                "type": device.device_type,
-                "power": device.state.get("power", False),
-                "online": device.is_online
+        device_manager = assistant.device_manager
+        version = device_manager.state_version
+        etag = f'W/"{_BOOT_ID}-{version}"'
+
+        # Dashboards poll this endpoint - nothing changed, nothing to send
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+
+        if _devices_cache is None or _devices_cache[0] != version:
+            logger.info("📱 Getting all devices...")
+            devices = {
+                "lamps": [device.to_api_dict() for device in device_manager.get_devices_by_type("lamp")],
+                "acs": [device.to_api_dict() for device in device_manager.get_devices_by_type("ac")],
+                "tvs": [device.to_api_dict() for device in device_manager.get_devices_by_type("tv")]
             }
+            _devices_cache = (version, orjson.dumps(devices))
 
-            if device.device_type == "lamp":
-                device_info.update({
-                    "brightness": device.state.get("brightness", 100),
-                    "color": device.state.get("color", "white")
-                })
-                devices["lamps"].append(device_info)
-            elif device.device_type == "ac":
-                device_info.update({
-                    "temperature": device.state.get("temperature", 22),
-                    "mode": device.state.get("mode", "cool"),
-                    "fan_speed": device.state.get("fan_speed", "medium")
-                })
-                devices["acs"].append(device_info)
-            elif device.device_type == "tv":
-                device_info.update({
-                    "channel": device.state.get("channel", 1),
-                    "volume": device.state.get("volume", 50),
-                    "input": device.state.get("input", "hdmi1")
-                })
-                devices["tvs"].append(device_info)
-
-        return devices
+        return Response(content=_devices_cache[1], media_type="application/json", headers={"ETag": etag})
 
     except Exception as e:
-        logger.error(f"Error getting devices: {e}")
+        logger.error("Error getting devices: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Toggle responses are built by splicing the orjson-encoded message into fixed bytes
+_TOGGLE_OK = b'{"success":true,"message":%s}'
+_TOGGLE_FAILED = b'{"success":false,"message":%s}'
+
+
+def _toggle_response(template: bytes, message: str) -> Response:
+    """Render a toggle result without building a dict or going through jsonable_encoder"""
+    return Response(content=template % orjson.dumps(message), media_type="application/json")
+
+
 @app.post("/api/devices/{device_id}/toggle")
 async def toggle_device(device_id: str):
     """Toggle device power"""
@@ -352,18 +614,18 @@ async def toggle_device(device_id: str):
         raise HTTPException(status_code=500, detail="Assistant not initialized")
 
     try:
-        logger.info(f"🔄 Toggling device: {device_id}")
+        logger.info("🔄 Toggling device: %s", device_id)
         device = assistant.device_manager.get_device(device_id)
         if not device:
-            return {"success": False, "message": f"Device {device_id} not found"}
+            return _toggle_response(_TOGGLE_FAILED, f"Device {device_id} not found")
 
         result = device.toggle()
 
-        return {"success": True, "message": result}
+        return _toggle_response(_TOGGLE_OK, result)
 
     except Exception as e:
-        logger.error(f"Error toggling device {device_id}: {e}")
-        return {"success": False, "message": f"Error: {str(e)}"}
+        logger.error("Error toggling device %s: %s", device_id, e)
+        return _toggle_response(_TOGGLE_FAILED, f"Error: {str(e)}")
 
 
 @app.get("/api/status")
@@ -377,26 +639,36 @@ async def get_system_status():
         # Add voice status
         status["voice"] = {
             "available": VOICE_AVAILABLE,
-            "whisper_loaded": whisper_model is not None,
+            "whisper_loaded": is_whisper_loaded(),
             "tts_available": VOICE_AVAILABLE,
             "supported_languages": ["en", "fa"] if VOICE_AVAILABLE else []
         }
         status["websocket_support"] = False
-        return status
+        return ORJSONResponse(status)
     except Exception as e:
-        logger.error(f"Error getting system status: {e}")
+        logger.error("Error getting system status: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # Error handlers
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
-    return {"error": "Endpoint not found", "message": "This endpoint does not exist"}
+    # Unmatched routes carry Starlette's default "Not Found"; keep details raised by our own endpoints
+    detail = getattr(exc, "detail", None)
+    if detail and detail != "Not Found":
+        return ORJSONResponse({"error": "Not found", "message": detail}, status_code=404)
+    return ORJSONResponse(
+        {"error": "Endpoint not found", "message": "This endpoint does not exist"},
+        status_code=404
+    )
 
 
 @app.exception_handler(500)
 async def internal_error_handler(request, exc):
-    return {"error": "Internal server error", "message": "Something went wrong on the server"}
+    return ORJSONResponse(
+        {"error": "Internal server error", "message": "Something went wrong on the server"},
+        status_code=500
+    )
 
 
 if __name__ == "__main__":
@@ -410,4 +682,23 @@ if __name__ == "__main__":
     print("🔌 WebSocket Support: ❌ Disabled (use polling instead)")
     print("=" * 70)
 
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    # Device state, the audio clip store and the Whisper model live in each worker
+    # process, so only raise API_WORKERS for stateless deployments. Each worker
+    # loads its own Whisper instance; the model runs its kernels outside the GIL,
+    # so workers can share one GPU.
+    workers = int(os.getenv("API_WORKERS", "1"))
+    # Cap in-flight requests so a burst of voice commands gets 503s instead of
+    # queuing unbounded Whisper jobs
+    limit_concurrency = int(os.getenv("API_LIMIT_CONCURRENCY", "64")) or None
+
+    uvicorn.run(
+        "api_server:app" if workers > 1 else app,
+        host="0.0.0.0",
+        port=8000,
+        log_level="info",
+        # uvicorn[standard] ships uvloop (not on Windows) and httptools
+        loop="uvloop" if find_spec("uvloop") else "asyncio",
+        http="httptools" if find_spec("httptools") else "h11",
+        workers=workers,
+        limit_concurrency=limit_concurrency
+    )
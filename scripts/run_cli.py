@@ -1,13 +1,16 @@
 import sys
 
-from smart_home.core.assistant import SmartHomeAssistant
-from smart_home.interfaces.command_line_interface import CLIInterface
-
 
 def main():
     """Run the CLI interface directly"""
+    if "--help" in sys.argv or "-h" in sys.argv:
+        print("Usage: python run_cli.py\nStarts the Smart Home Assistant text chat.")
+        return
+
     try:
         print("🔄 Initializing Smart Home Assistant...")
+        from smart_home.core.assistant import SmartHomeAssistant
+        from smart_home.interfaces.command_line_interface import CLIInterface
 
         # Initialize the assistant
         assistant = SmartHomeAssistant()
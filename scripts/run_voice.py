@@ -1,8 +1,6 @@
 import sys
-import os
 import logging
-
-from smart_home.core.assistant import SmartHomeAssistant
+from importlib.util import find_spec
 
 # Configure logging
 logging.basicConfig(
@@ -13,32 +11,19 @@ logging.basicConfig(
 
 def check_voice_dependencies():
     """Check if voice dependencies are installed"""
-    missing_deps = []
-
-    try:
-        import whisper
-    except ImportError:
-        missing_deps.append("openai-whisper")
-
-    try:
-        import sounddevice
-    except ImportError:
-        missing_deps.append("sounddevice")
-
-    try:
-        import pygame
-    except ImportError:
-        missing_deps.append("pygame")
-
-    try:
-        from gtts import gTTS
-    except ImportError:
-        missing_deps.append("gtts")
-
-    try:
-        import numpy
-    except ImportError:
-        missing_deps.append("numpy")
+    # find_spec only locates the modules, it doesn't run them (no torch / PortAudio / SDL load)
+    # Either Whisper backend will do (faster-whisper is preferred)
+    required = {
+        ("faster_whisper", "whisper"): "faster-whisper",
+        ("sounddevice",): "sounddevice",
+        ("pygame",): "pygame",
+        ("gtts",): "gtts",
+        ("numpy",): "numpy",
+    }
+    missing_deps = [
+        package for modules, package in required.items()
+        if all(find_spec(module) is None for module in modules)
+    ]
 
     if missing_deps:
         print("❌ Missing voice dependencies:")
@@ -55,6 +40,10 @@ def check_voice_dependencies():
 
 
 def main():
+    if "--help" in sys.argv or "-h" in sys.argv:
+        print("Usage: python run_voice.py\nStarts the Smart Home Assistant voice interface.")
+        return
+
     try:
         print("🔍 Checking voice dependencies...")
         if not check_voice_dependencies():
@@ -63,16 +52,18 @@ def main():
         print("🔄 Initializing Smart Home Assistant for Voice...")
 
         # Initialize the assistant
+        from smart_home.core.assistant import SmartHomeAssistant
+
         assistant = SmartHomeAssistant()
 
         # Import and run voice interface
         from smart_home.interfaces.voice_interface import VoiceInterface
 
         print("🎤 Starting Voice Interface...")
-        print("💡 Say 'Hey assistant' followed by your command")
-        print("💡 Press Ctrl+C to stop")
-
         voice_interface = VoiceInterface(assistant)
+
+        print(f"💡 Say '{voice_interface.wake_words[0].capitalize()}' followed by your command")
+        print("💡 Press Ctrl+C to stop")
         voice_interface.run()
 
     except KeyboardInterrupt:
@@ -1,8 +1,64 @@
+import asyncio
+import sys
 import webbrowser
-import time
+from importlib.util import find_spec
+
+_VERSION = "2.0.0"
+_HELP = """Usage: python start_api.py [-h | --help | --version]
+
+Starts the Smart Home Assistant API server on http://localhost:8000
+and opens the API docs in the browser.
+"""
+
+
+DOCS_URL = "http://localhost:8000/docs"
+
+_background_tasks = set()
+
+
+async def wait_for_port(host: str, port: int, timeout: float = 5.0) -> bool:
+    """Poll until something accepts TCP connections on host:port (or the timeout passes)"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            await asyncio.sleep(0.05)
+            continue
+        writer.close()
+        return True
+    return False
+
+
+async def open_docs_when_ready():
+    """Open the API docs in the browser once the server is listening"""
+    if not await wait_for_port("127.0.0.1", 8000):
+        return
+    try:
+        # webbrowser.open can block while it launches the browser - keep it off the server's loop
+        await asyncio.to_thread(webbrowser.open, DOCS_URL)
+        print("📚 Opened API docs in browser")
+    except Exception:
+        pass
+
+
+def schedule_docs_opening():
+    """Startup hook: the socket is bound right after startup, so poll for it on the server's loop"""
+    task = asyncio.get_running_loop().create_task(open_docs_when_ready())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
 
 def main():
+    # Answer help/version before importing uvicorn and the FastAPI app
+    if "--version" in sys.argv:
+        print(f"Smart Home Assistant API {_VERSION}")
+        return
+    if "-h" in sys.argv or "--help" in sys.argv:
+        print(_HELP)
+        return
+
     print("\n🚀 Starting Smart Home Assistant API Server")
     print("=" * 50)
 
@@ -15,26 +71,25 @@ def main():
         print("📚 API Docs: http://localhost:8000/docs")
         print("=" * 50)
 
-        # Open browser after a delay
-        def open_browser():
-            time.sleep(3)
-            try:
-                webbrowser.open("http://localhost:8000/docs")
-                print("📚 Opened API docs in browser")
-            except:
-                pass
+        # Open browser from the server's own event loop once it is listening
+        app.add_event_handler("startup", schedule_docs_opening)
 
-        import threading
-        browser_thread = threading.Thread(target=open_browser, daemon=True)
-        browser_thread.start()
-
-        # Start the server (this will block)
-        uvicorn.run(
+        # Serve the already-imported app directly (no import-string lookup),
+        # without per-request access log lines
+        config = uvicorn.Config(
             app,
             host="0.0.0.0",
             port=8000,
-            log_level="info"
+            log_level="info",
+            access_log=False,
+            reload=False,
+            workers=1,
+            loop="uvloop" if find_spec("uvloop") else "asyncio"
         )
+        server = uvicorn.Server(config)
+
+        # Start the server (this will block)
+        server.run()
 
     except KeyboardInterrupt:
         print("\n🛑 Server stopped")
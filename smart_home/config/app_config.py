@@ -1,17 +1,30 @@
 import os
 from dataclasses import dataclass, field
-from typing import List
-from dotenv import load_dotenv
+from functools import cached_property
+from typing import List, Optional
 
-load_dotenv()
+_ENV_LOADED = False
+
+
+def _ensure_env_loaded() -> None:
+    """Load the .env file once, the first time configuration is needed"""
+    global _ENV_LOADED
+    if not _ENV_LOADED:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _ENV_LOADED = True
+
+
+_TRUE_VALUES = frozenset(("1", "true"))
 
 
 @dataclass
 class Config:
-    # API Keys
-    groq_api_key: str = field(default_factory=lambda: os.getenv("GROQ_API_KEY", ""))
-    weather_api_key: str = field(default_factory=lambda: os.getenv("WEATHER_API_KEY", ""))
-    news_api_key: str = field(default_factory=lambda: os.getenv("NEWS_API_KEY", ""))
+    # API Keys (None = read from the environment)
+    groq_api_key: Optional[str] = None
+    weather_api_key: Optional[str] = None
+    news_api_key: Optional[str] = None
 
     # Device Configuration
     lamps: List[str] = field(default_factory=lambda: ["Kitchen", "Bathroom", "Room 1", "Room 2"])
@@ -20,24 +33,65 @@ class Config:
 
     # Voice Configuration
     wake_words: List[str] = field(default_factory=lambda: ["hey assistant", "assistant"])
+    enable_voice: Optional[bool] = None
 
     # Application Settings
-    debug: bool = field(default_factory=lambda: os.getenv("DEBUG", "False").lower() == "true")
-    log_level: str = field(default_factory=lambda: os.getenv("LOG_LEVEL", "INFO"))
-    default_city: str = field(default_factory=lambda: os.getenv("DEFAULT_CITY", "Tehran"))
+    debug: Optional[bool] = None
+    log_level: Optional[str] = None
+    default_city: Optional[str] = None
+    cors_origins: Optional[List[str]] = None
+
+    def __post_init__(self):
+        """Fill settings that weren't passed explicitly from one pass over the environment"""
+        _ensure_env_loaded()
+        env = os.environ.get
+
+        if self.groq_api_key is None:
+            self.groq_api_key = env("GROQ_API_KEY", "")
+        if self.weather_api_key is None:
+            self.weather_api_key = env("WEATHER_API_KEY", "")
+        if self.news_api_key is None:
+            self.news_api_key = env("NEWS_API_KEY", "")
+        if self.enable_voice is None:
+            self.enable_voice = env("ENABLE_VOICE", "true").lower() in _TRUE_VALUES
+        if self.debug is None:
+            self.debug = env("DEBUG", "False").lower() == "true"
+        if self.log_level is None:
+            self.log_level = env("LOG_LEVEL", "INFO")
+        if self.default_city is None:
+            self.default_city = env("DEFAULT_CITY", "Tehran")
+        if self.cors_origins is None:
+            self.cors_origins = [o.strip() for o in env("CORS_ORIGINS", "*").split(",") if o.strip()]
+
+    # Keys don't change after startup, so each check is evaluated once per instance
+    @cached_property
+    def _groq_configured(self) -> bool:
+        return bool(self.groq_api_key and self.groq_api_key != "your_groq_api_key_here")
+
+    @cached_property
+    def _weather_configured(self) -> bool:
+        return bool(self.weather_api_key and self.weather_api_key != "your_weather_api_key")
+
+    @cached_property
+    def _news_configured(self) -> bool:
+        return bool(self.news_api_key and self.news_api_key != "your_news_api_key")
 
     def is_groq_configured(self) -> bool:
         """Check if Groq API is configured"""
-        return bool(self.groq_api_key and self.groq_api_key != "your_groq_api_key_here")
+        return self._groq_configured
 
     def is_weather_configured(self) -> bool:
         """Check if Weather API is configured"""
-        return bool(self.weather_api_key and self.weather_api_key != "your_weather_api_key")
+        return self._weather_configured
 
     def is_news_configured(self) -> bool:
         """Check if News API is configured"""
-        return bool(self.news_api_key and self.news_api_key != "your_news_api_key")
+        return self._news_configured
 
 
-# Global config instance
-my_config = Config()
+def __getattr__(name: str):
+    """Create the global config instance on first access (PEP 562)"""
+    if name == "my_config":
+        config = globals()["my_config"] = Config()
+        return config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
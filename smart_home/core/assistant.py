@@ -1,14 +1,50 @@
 import logging
-from typing import Dict, Any, Optional
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import Dict, Any, Iterator, Optional, Tuple
 from smart_home.config.app_config import my_config
 from smart_home.devices.device_manager import DeviceManager
-from smart_home.services.llm_service import LLMService
-from smart_home.services.weather_service import WeatherService
-from smart_home.services.news_service import NewsService
-from smart_home.services.persian_service import PersianService
 
 logger = logging.getLogger(__name__)
 
+# Response cache for repeated commands
+RESPONSE_CACHE_SIZE = 512
+RESPONSE_CACHE_TTL = 60.0  # seconds
+
+# Single-step device commands go to the fast model; anything compound or informational doesn't
+_SIMPLE_DEVICE_COMMAND_RE = re.compile(
+    r"^(?:please\s+)?(?:(?:turn|switch)\s+(?:on|off)|toggle|set)\b",
+    re.IGNORECASE
+)
+_COMPLEX_INTENT_RE = re.compile(r"\b(?:and|then|if|weather|news|time|status)\b", re.IGNORECASE)
+
+# Initialization summary pieces
+_BORDER = "🏠" + "=" * 58 + "🏠"
+_WEATHER_TIP = "\n💡 Enable weather: Add WEATHER_API_KEY to .env\n   Get free key: https://openweathermap.org/api"
+_NEWS_TIP = "💡 Enable news: Add NEWS_API_KEY to .env\n   Get free key: https://newsapi.org/"
+
+# Keep-alive pool shared by the HTTP-based services
+HTTP_POOL_SIZE = 10
+
+# Answers to these change over time even when no device does
+_VOLATILE_INTENT_RE = re.compile(
+    r"weather|forecast|news|time|date|today|هوا|خبر|اخبار|ساعت|وقت|زمان|تاریخ|امروز",
+    re.IGNORECASE
+)
+
+# Commands that lean on earlier turns ("turn it off", "what about the bedroom one") - the LLM
+# reads the conversation history to resolve them, so their answers can't be reused
+_CONTEXTUAL_RE = re.compile(
+    r"\b(?:it|its|that|this|these|those|them|they|there|one|ones|same|again|also|too|else|other|"
+    r"another|instead|previous|last|about|اون|آن|این|همون|همین|اونو|اینو|دوباره|هم|دیگه|دیگر|قبلی)\b",
+    re.IGNORECASE
+)
+
 
 class SmartHomeAssistant:
     """
@@ -36,6 +72,10 @@ class SmartHomeAssistant:
                 "3. Get free key from: https://console.groq.com"
             )
 
+        # (normalized input, device state version) -> (stored at, response)
+        self._response_cache: "OrderedDict[Tuple[str, int], Tuple[float, str]]" = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+
         # Initialize core components
         self._initialize_components()
 
@@ -44,64 +84,98 @@ class SmartHomeAssistant:
         logger.info("Smart Home Assistant initialized successfully")
 
     def _initialize_components(self):
-        """Initialize all components in correct order"""
+        """Initialize core components (services are created on first use)"""
         try:
             # Initialize device manager
             print("🔄 Loading devices...")
             self.device_manager = DeviceManager()
 
-            # Initialize services
-            print("🔄 Connecting to LLM service...")
-            self.llm_service = LLMService()
-
-            print("🔄 Setting up external services...")
-            self.weather_service = WeatherService() if my_config.is_weather_configured() else None
-            self.news_service = NewsService() if my_config.is_news_configured() else None
-
-            print("🔄 Initializing Persian language support...")
-            self.persian_service = PersianService(self.llm_service)
-
         except Exception as e:
             logger.error(f"Failed to initialize components: {e}")
             raise
 
+    @cached_property
+    def llm_service(self):
+        """LLM service, connected on first use"""
+        from smart_home.services.llm_service import LLMService
+        logger.info("Connecting to LLM service...")
+        return LLMService()
+
+    @cached_property
+    def http_session(self):
+        """Session whose connections are kept alive between requests"""
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @cached_property
+    def weather_service(self):
+        """Weather service, or None when not configured"""
+        if not my_config.is_weather_configured():
+            return None
+        from smart_home.services.weather_service import WeatherService
+        return WeatherService(self.http_session)
+
+    @cached_property
+    def news_service(self):
+        """News service, or None when not configured"""
+        if not my_config.is_news_configured():
+            return None
+        from smart_home.services.news_service import NewsService
+        return NewsService(self.http_session)
+
+    @cached_property
+    def persian_service(self):
+        """Persian language support, set up on first use"""
+        from smart_home.services.persian_service import PersianService
+        return PersianService(self.llm_service)
+
     def _show_initialization_summary(self):
         """Show initialization summary"""
-        print("\n" + "🏠" + "=" * 58 + "🏠")
-        print("             SMART HOME ASSISTANT READY")
-        print("🏠" + "=" * 58 + "🏠")
-
-        # Device summary
-        device_count = len(self.device_manager.get_all_devices())
-        print(f"📱 Devices: {device_count} smart devices loaded")
-        print(f"   💡 Lamps: {len(my_config.lamps)} locations")
-        print(f"   ❄️  ACs: {len(my_config.acs)} locations")
-        print(f"   📺 TVs: {len(my_config.tvs)} locations")
-
-        # Language support
-        print(f"🌍 Languages: English + Persian (automatic detection)")
-
-        # Services status
-        print(f"🤖 LLM: ✅ Groq LLaMA 3.3 70B")
-        weather_status = "✅ Connected" if self.weather_service else "❌ Not configured"
-        news_status = "✅ Connected" if self.news_service else "❌ Not configured"
-        print(f"🌤️  Weather: {weather_status}")
-        print(f"📰 News: {news_status}")
-        print(f"🕒 Time: ✅ Available")
-
-        # Persian support
-        print(f"🇮🇷 Persian: ✅ Detection + Translation")
+        device_count = len(self.device_manager.devices)
+        weather_configured = my_config.is_weather_configured()
+        news_configured = my_config.is_news_configured()
+        weather_status = "✅ Connected" if weather_configured else "❌ Not configured"
+        news_status = "✅ Connected" if news_configured else "❌ Not configured"
+
+        lines = [
+            "",
+            _BORDER,
+            "             SMART HOME ASSISTANT READY",
+            _BORDER,
+            # Device summary
+            f"📱 Devices: {device_count} smart devices loaded",
+            f"   💡 Lamps: {len(my_config.lamps)} locations",
+            f"   ❄️  ACs: {len(my_config.acs)} locations",
+            f"   📺 TVs: {len(my_config.tvs)} locations",
+            # Language support
+            "🌍 Languages: English + Persian (automatic detection)",
+            # Services status
+            "🤖 LLM: ✅ Groq LLaMA 3.3 70B",
+            f"🌤️  Weather: {weather_status}",
+            f"📰 News: {news_status}",
+            "🕒 Time: ✅ Available",
+            # Persian support
+            "🇮🇷 Persian: ✅ Detection + Translation",
+        ]
 
         # Quick setup tips
-        if not self.weather_service:
-            print(f"\n💡 Enable weather: Add WEATHER_API_KEY to .env")
-            print(f"   Get free key: https://openweathermap.org/api")
+        if not weather_configured:
+            lines.append(_WEATHER_TIP)
 
-        if not self.news_service:
-            print(f"💡 Enable news: Add NEWS_API_KEY to .env")
-            print(f"   Get free key: https://newsapi.org/")
+        if not news_configured:
+            lines.append(_NEWS_TIP)
+
+        lines.append(_BORDER)
 
-        print("🏠" + "=" * 58 + "🏠")
+        # One write instead of a print per line
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
     def process_command(self, user_input: str) -> str:
         """
@@ -113,14 +187,111 @@ class SmartHomeAssistant:
         Returns:
             Response in the same language as input
         """
+        if not user_input or not user_input.strip():
+            return "❌ Please provide a command"
+
+        cache_key = self._response_cache_key(user_input)
+        if cache_key is None:
+            return self._process_command_uncached(user_input)
+
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            logger.info(f"Cached response for: '{user_input}'")
+            self.llm_service.save_to_history(user_input, cached)
+            return cached
+
+        response = self._process_command_uncached(user_input)
+        self._cache_if_unchanged(cache_key, response)
+        return response
+
+    def stream_command(self, user_input: str) -> Iterator[str]:
+        """
+        Process user command, yielding the response as it's generated
+
+        English responses stream from the LLM; Persian ones are translated
+        as a whole, so they arrive in a single chunk.
+        """
+        if not user_input or not user_input.strip() or self.persian_service.is_persian(user_input):
+            yield self.process_command(user_input)
+            return
+
+        cache_key = self._response_cache_key(user_input)
+        if cache_key is not None:
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                logger.info(f"Cached response for: '{user_input}'")
+                self.llm_service.save_to_history(user_input, cached)
+                yield cached
+                return
+
+        logger.info(f"Processing command: '{user_input}'")
+        parts = []
         try:
-            if not user_input or not user_input.strip():
-                return "❌ Please provide a command"
+            for piece in self.llm_service.process_command_stream(
+                command=user_input,
+                device_manager=self.device_manager,
+                weather_service=self.weather_service,
+                news_service=self.news_service,
+                fast=self._is_simple_command(user_input)
+            ):
+                parts.append(piece)
+                yield piece
+        except Exception as e:
+            logger.error(f"Error processing command: {e}")
+            yield f"❌ Sorry, an error occurred: {str(e)}"
+            return
+
+        if cache_key is not None:
+            self._cache_if_unchanged(cache_key, "".join(parts))
+
+    def _cache_if_unchanged(self, key: Tuple[str, int], response: str):
+        """Cache a response if the command left every device as it was"""
+        if (self.device_manager.state_version == key[1]
+                and not response.startswith(("❌", "متأسفم"))):
+            self._store_response(key, response)
+
+    def _response_cache_key(self, user_input: str) -> Optional[Tuple[str, int]]:
+        """Cache key for a command, or None when its answer shouldn't be reused"""
+        words = user_input.lower().split()
+        normalized = " ".join(words)
+
+        # Short replies ("yes", "22", "kitchen") and references to earlier turns depend on the
+        # conversation so far; only self-contained commands get the same answer every time
+        if len(words) < 3 or _VOLATILE_INTENT_RE.search(normalized) or _CONTEXTUAL_RE.search(normalized):
+            return None
+
+        return normalized, self.device_manager.state_version
+
+    def _get_cached_response(self, key: Tuple[str, int]) -> Optional[str]:
+        """Get a cached response that hasn't expired"""
+        with self._response_cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > RESPONSE_CACHE_TTL:
+                del self._response_cache[key]
+                return None
+            self._response_cache.move_to_end(key)
+            return entry[1]
+
+    def _store_response(self, key: Tuple[str, int], response: str):
+        """Cache a response, evicting the least recently used entries"""
+        with self._response_cache_lock:
+            self._response_cache[key] = (time.monotonic(), response)
+            self._response_cache.move_to_end(key)
+            while len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+
+    def _process_command_uncached(self, user_input: str) -> str:
+        """Process a command through translation and the LLM"""
+        # Detect once - the error path below needs it too
+        is_persian = self.persian_service.is_persian(user_input)
 
+        try:
             logger.info(f"Processing command: '{user_input}'")
 
-            # Check if input is Persian
-            english_command, is_persian = self.persian_service.process_command(user_input)
+            # Translate Persian input to English
+            english_command = self.persian_service.translate_to_english(user_input, is_persian=True) if is_persian else user_input
 
             if is_persian:
                 logger.info(f"Persian detected, translated to: '{english_command}'")
@@ -139,7 +310,7 @@ class SmartHomeAssistant:
         except Exception as e:
             logger.error(f"Error processing command: {e}")
             # Return error in appropriate language
-            if self.persian_service.is_persian(user_input):
+            if is_persian:
                 return f"متأسفم، خطایی رخ داده: {str(e)}"
             else:
                 return f"❌ Sorry, an error occurred: {str(e)}"
@@ -152,7 +323,8 @@ class SmartHomeAssistant:
                 command=command,
                 device_manager=self.device_manager,
                 weather_service=self.weather_service,
-                news_service=self.news_service
+                news_service=self.news_service,
+                fast=self._is_simple_command(command)
             )
 
             return response
@@ -161,6 +333,12 @@ class SmartHomeAssistant:
             logger.error(f"Error processing English command: {e}")
             return f"❌ Error processing command: {str(e)}"
 
+    @staticmethod
+    def _is_simple_command(command: str) -> bool:
+        """Whether a command is a single device action the fast model can handle"""
+        command = command.strip()
+        return bool(_SIMPLE_DEVICE_COMMAND_RE.match(command)) and not _COMPLEX_INTENT_RE.search(command)
+
     def get_device_status(self, device_name: str = "all") -> str:
         """Get status of devices"""
         try:
@@ -172,18 +350,15 @@ class SmartHomeAssistant:
     def get_system_status(self) -> Dict[str, Any]:
         """Get comprehensive system status"""
         try:
-            device_count = len(self.device_manager.get_all_devices())
+            device_count = len(self.device_manager.devices)
 
             # Count devices by type
             lamp_count = len(self.device_manager.get_devices_by_type("lamp"))
             ac_count = len(self.device_manager.get_devices_by_type("ac"))
             tv_count = len(self.device_manager.get_devices_by_type("tv"))
 
-            # Count powered on devices
-            powered_devices = 0
-            for device in self.device_manager.get_all_devices().values():
-                if device.state.get("power", False):
-                    powered_devices += 1
+            # Kept up to date by the device manager as devices change
+            powered_devices = self.device_manager.powered_on_count
 
             return {
                 "total_devices": device_count,
@@ -195,8 +370,8 @@ class SmartHomeAssistant:
                 },
                 "services": {
                     "llm": "✅ Connected",
-                    "weather": "✅ Connected" if self.weather_service else "❌ Not configured",
-                    "news": "✅ Connected" if self.news_service else "❌ Not configured",
+                    "weather": "✅ Connected" if my_config.is_weather_configured() else "❌ Not configured",
+                    "news": "✅ Connected" if my_config.is_news_configured() else "❌ Not configured",
                     "persian": "✅ Available",
                     "time": "✅ Available"
                 },
@@ -212,55 +387,67 @@ class SmartHomeAssistant:
             logger.error(f"Error getting system status: {e}")
             return {"error": str(e)}
 
-    def test_services(self) -> Dict[str, str]:
-        """Test all services and return results"""
-        results = {}
+    def test_services(self) -> Dict[str, Tuple[bool, str]]:
+        """Test all services in parallel and return (ok, message) per service"""
+        probes = {
+            "llm": self._test_llm_service,
+            "weather": self._test_weather_service,
+            "news": self._test_news_service,
+            "persian": self._test_persian_service,
+            "devices": self._test_device_manager,
+        }
 
-        # Test LLM service
-        try:
-            test_response = self.llm_service.process_command(
-                "test", self.device_manager, self.weather_service, self.news_service
-            )
-            results["llm"] = "✅ Working" if test_response else "❌ No response"
-        except Exception as e:
-            results["llm"] = f"❌ Error: {str(e)}"
+        # Create services up front so the worker threads don't race to build them
+        for service in ("llm_service", "weather_service", "news_service", "persian_service"):
+            getattr(self, service)
 
-        # Test weather service
-        if self.weather_service:
-            try:
-                weather_response = self.weather_service.get_weather("Tehran")
-                results["weather"] = "✅ Working" if not weather_response.startswith("❌") else weather_response
-            except Exception as e:
-                results["weather"] = f"❌ Error: {str(e)}"
-        else:
-            results["weather"] = "❌ Not configured"
+        # The network probes are independent, so wait on them concurrently
+        with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+            futures = {name: executor.submit(probe) for name, probe in probes.items()}
 
-        # Test news service
-        if self.news_service:
+        results = {}
+        for name, future in futures.items():
             try:
-                news_response = self.news_service.get_news("technology")
-                results["news"] = "✅ Working" if not news_response.startswith("❌") else news_response
+                results[name] = future.result()
             except Exception as e:
-                results["news"] = f"❌ Error: {str(e)}"
-        else:
-            results["news"] = "❌ Not configured"
+                results[name] = (False, f"❌ Error: {str(e)}")
 
-        # Test Persian service
-        try:
-            persian_test = self.persian_service.is_persian("سلام")
-            english_test = self.persian_service.is_persian("hello")
-            results["persian"] = "✅ Working" if persian_test and not english_test else "❌ Detection issue"
-        except Exception as e:
-            results["persian"] = f"❌ Error: {str(e)}"
+        return results
 
-        # Test device manager
-        try:
-            device_status = self.device_manager.get_status()
-            results["devices"] = "✅ Working" if device_status else "❌ No devices"
-        except Exception as e:
-            results["devices"] = f"❌ Error: {str(e)}"
+    def _test_llm_service(self) -> Tuple[bool, str]:
+        """Test LLM service"""
+        test_response = self.llm_service.process_command(
+            "test", self.device_manager, self.weather_service, self.news_service
+        )
+        return (True, "✅ Working") if test_response else (False, "❌ No response")
 
-        return results
+    def _test_weather_service(self) -> Tuple[bool, str]:
+        """Test weather service"""
+        if not self.weather_service:
+            return False, "❌ Not configured"
+        weather_response = self.weather_service.get_weather("Tehran")
+        ok = not weather_response.startswith("❌")
+        return ok, "✅ Working" if ok else weather_response
+
+    def _test_news_service(self) -> Tuple[bool, str]:
+        """Test news service"""
+        if not self.news_service:
+            return False, "❌ Not configured"
+        news_response = self.news_service.get_news("technology")
+        ok = not news_response.startswith("❌")
+        return ok, "✅ Working" if ok else news_response
+
+    def _test_persian_service(self) -> Tuple[bool, str]:
+        """Test Persian service"""
+        persian_test = self.persian_service.is_persian("سلام")
+        english_test = self.persian_service.is_persian("hello")
+        ok = persian_test and not english_test
+        return ok, "✅ Working" if ok else "❌ Detection issue"
+
+    def _test_device_manager(self) -> Tuple[bool, str]:
+        """Test device manager"""
+        device_status = self.device_manager.get_status()
+        return (True, "✅ Working") if device_status else (False, "❌ No devices")
 
     def get_example_commands(self) -> Dict[str, list]:
         """Get example commands for demonstration"""
@@ -305,6 +492,6 @@ class SmartHomeAssistant:
         """Technical representation of the assistant"""
         return (f"SmartHomeAssistant("
                 f"devices={len(self.device_manager.get_all_devices())}, "
-                f"weather={'✅' if self.weather_service else '❌'}, "
-                f"news={'✅' if self.news_service else '❌'}, "
+                f"weather={'✅' if my_config.is_weather_configured() else '❌'}, "
+                f"news={'✅' if my_config.is_news_configured() else '❌'}, "
                 f"persian=✅)")
@@ -1,19 +1,38 @@
-from datetime import datetime
-from typing import List
-from smart_home.devices.base_device import SmartHomeDevice
+from typing import Any, Dict, List
+from smart_home.devices.base_device import SmartHomeDevice, as_int, value_action
+
+# Display order for modes and fan speeds; the class validates against sets built from these
+MODES = ("cool", "heat", "fan", "auto", "dry")
+FAN_SPEEDS = ("low", "medium", "high", "auto")
+MODE_EMOJIS = {
+    "cool": "❄️", "heat": "🔥", "fan": "💨",
+    "auto": "🔄", "dry": "💧"
+}
+
+_STATUS_ON_TEMPLATE = "{name} ({location}): ON 🟢 - {temperature}°C 🌡️, {mode} mode {mode_emoji}, {fan_speed} fan 💨"
 
 
 class SmartAirConditioner(SmartHomeDevice):
     """Smart AC with temperature, mode, and fan speed control"""
 
+    __slots__ = ()
+
     MIN_TEMPERATURE = 16
     MAX_TEMPERATURE = 30
-    VALID_MODES = ["cool", "heat", "fan", "auto", "dry"]
-    VALID_FAN_SPEEDS = ["low", "medium", "high", "auto"]
-
-    MODE_EMOJIS = {
-        "cool": "❄️", "heat": "🔥", "fan": "💨",
-        "auto": "🔄", "dry": "💧"
+    VALID_MODES = frozenset(MODES)
+    VALID_FAN_SPEEDS = frozenset(FAN_SPEEDS)
+    MODE_EMOJIS = MODE_EMOJIS
+
+    INVALID_MODE_MESSAGE = f"❌ Invalid mode. Available: {', '.join(MODES)}"
+    INVALID_FAN_SPEED_MESSAGE = f"❌ Invalid fan speed. Available: {', '.join(FAN_SPEEDS)}"
+    INVALID_TEMPERATURE_MESSAGE = f"❌ Invalid temperature. Please use {MIN_TEMPERATURE}-{MAX_TEMPERATURE}°C"
+
+    ACTIONS = {
+        **SmartHomeDevice.ACTIONS,
+        "temperature": value_action(lambda device, value: device.set_temperature(value),
+                                    "❌ Please specify temperature (16-30°C)"),
+        "mode": value_action(lambda device, value: device.set_mode(value), "❌ Please specify mode"),
+        "fan_speed": value_action(lambda device, value: device.set_fan_speed(value), "❌ Please specify fan speed"),
     }
 
     def __init__(self, location: str, default_temperature: int = 22,
@@ -34,16 +53,21 @@ class SmartAirConditioner(SmartHomeDevice):
         if not self.state.get("power"):
             return f"❌ {self.name} is off. Turn it on first"
 
-        try:
-            temp = max(self.MIN_TEMPERATURE, min(self.MAX_TEMPERATURE, int(temp)))
-            self.state["temperature"] = temp
-            self.last_updated = datetime.now()
+        # Type check instead of try/except - callers pass numbers already
+        temp = as_int(temp)
+        if temp is None:
+            return self.INVALID_TEMPERATURE_MESSAGE
+
+        if temp < self.MIN_TEMPERATURE:
+            temp = self.MIN_TEMPERATURE
+        elif temp > self.MAX_TEMPERATURE:
+            temp = self.MAX_TEMPERATURE
 
-            emoji = "❄️" if temp <= 20 else "🔥" if temp >= 25 else "🌡️"
-            return f"{emoji} {self.name} temperature set to {temp}°C"
+        self.state["temperature"] = temp
+        self._mark_changed()
 
-        except (ValueError, TypeError):
-            return f"❌ Invalid temperature. Please use {self.MIN_TEMPERATURE}-{self.MAX_TEMPERATURE}°C"
+        emoji = "❄️" if temp <= 20 else "🔥" if temp >= 25 else "🌡️"
+        return f"{emoji} {self.name} temperature set to {temp}°C"
 
     def set_mode(self, mode: str) -> str:
         """Set AC mode with validation"""
@@ -53,15 +77,16 @@ class SmartAirConditioner(SmartHomeDevice):
         if not self.state.get("power"):
             return f"❌ {self.name} is off. Turn it on first"
 
-        mode_normalized = mode.lower().strip()
+        # The LLM usually sends the canonical value already
+        mode_normalized = mode if mode in self.VALID_MODES else mode.lower().strip()
 
         if mode_normalized in self.VALID_MODES:
             self.state["mode"] = mode_normalized
-            self.last_updated = datetime.now()
-            emoji = self.MODE_EMOJIS.get(mode_normalized, "❄️")
+            self._mark_changed()
+            emoji = MODE_EMOJIS.get(mode_normalized, "❄️")
             return f"{emoji} {self.name} mode set to {mode_normalized}"
 
-        return f"❌ Invalid mode. Available: {', '.join(self.VALID_MODES)}"
+        return self.INVALID_MODE_MESSAGE
 
     def set_fan_speed(self, speed: str) -> str:
         """Set fan speed with validation"""
@@ -71,25 +96,34 @@ class SmartAirConditioner(SmartHomeDevice):
         if not self.state.get("power"):
             return f"❌ {self.name} is off. Turn it on first"
 
-        speed_normalized = speed.lower().strip()
+        speed_normalized = speed if speed in self.VALID_FAN_SPEEDS else speed.lower().strip()
 
         if speed_normalized in self.VALID_FAN_SPEEDS:
             self.state["fan_speed"] = speed_normalized
-            self.last_updated = datetime.now()
+            self._mark_changed()
             return f"💨 {self.name} fan speed set to {speed_normalized}"
 
-        return f"❌ Invalid fan speed. Available: {', '.join(self.VALID_FAN_SPEEDS)}"
+        return self.INVALID_FAN_SPEED_MESSAGE
+
+    def to_api_dict(self) -> Dict[str, Any]:
+        """Get AC fields exposed by the REST API"""
+        info = super().to_api_dict()
+        info["temperature"] = self.state["temperature"]
+        info["mode"] = self.state["mode"]
+        info["fan_speed"] = self.state["fan_speed"]
+        return info
 
-    def get_status(self) -> str:
+    def _render_status(self) -> str:
         """Get formatted AC status"""
         if not self.is_online:
             return f"{self.name} ({self.location}): OFFLINE 🔴"
 
-        if self.state.get("power"):
-            mode_emoji = self.MODE_EMOJIS.get(self.state.get("mode"), "❄️")
-            return (f"{self.name} ({self.location}): ON 🟢 - "
-                    f"{self.state.get('temperature')}°C 🌡️, "
-                    f"{self.state.get('mode')} mode {mode_emoji}, "
-                    f"{self.state.get('fan_speed')} fan 💨")
+        state = self.state
+        if state.get("power"):
+            mode = state.get("mode")
+            return _STATUS_ON_TEMPLATE.format(
+                name=self.name, location=self.location, temperature=state.get("temperature"),
+                mode=mode, mode_emoji=MODE_EMOJIS.get(mode, "❄️"), fan_speed=state.get("fan_speed")
+            )
 
         return f"{self.name} ({self.location}): OFF 🔴"
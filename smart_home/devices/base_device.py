@@ -1,19 +1,71 @@
+import math
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Optional, Tuple
+
+DeviceAction = Callable[["SmartHomeDevice", Optional[str]], str]
+
+
+def value_action(apply: DeviceAction, missing_message: str) -> DeviceAction:
+    """Wrap an action that needs a value, answering missing_message when none is given"""
+    def action(device: "SmartHomeDevice", value: Optional[str]) -> str:
+        return apply(device, value) if value else missing_message
+    return action
+
+
+def as_int(value: Any) -> Optional[int]:
+    """Convert a numeric setter argument to int, or None if it isn't one (no exceptions raised)"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value) if math.isfinite(value) else None
+    if isinstance(value, str):
+        value = value.strip()
+        digits = value[1:] if value.startswith(("-", "+")) else value
+        if digits.isdecimal():  # isdecimal, not isdigit: int() rejects "²"
+            return int(value)
+    return None
 
 
 class SmartHomeDevice(ABC):
     """Abstract base class for all smart home devices"""
 
+    # Fixed attribute layout: no per-instance __dict__ (subclasses declare empty slots)
+    __slots__ = ("name", "location", "device_type", "device_id", "state",
+                 "last_updated", "is_online", "_on_change", "_status_cache")
+
+    # Action name -> handler(device, value), looked up by DeviceManager
+    ACTIONS: Dict[str, DeviceAction] = {
+        "on": lambda device, value: device.turn_on(),
+        "off": lambda device, value: device.turn_off(),
+        "toggle": lambda device, value: device.toggle(),
+    }
+
     def __init__(self, name: str, location: str, device_type: str, initial_state: Dict[str, Any] = None):
         self.name = name
         self.location = location
         self.device_type = device_type
         self.device_id = f"{location.lower().replace(' ', '_')}_{device_type}"
         self.state = initial_state or {"power": False}
-        self.last_updated = datetime.now()
+        self.last_updated = time.time()  # epoch seconds, see last_updated_at
         self.is_online = True
+        self._on_change: Optional[Callable[["SmartHomeDevice"], None]] = None
+        self._status_cache: Optional[Tuple[bool, str]] = None  # (is_online, rendered status)
+
+    @property
+    def last_updated_at(self) -> datetime:
+        """Time of the last state change as a datetime"""
+        return datetime.fromtimestamp(self.last_updated)
+
+    def _mark_changed(self, now: Optional[float] = None) -> None:
+        """Record a state change and notify the owning device manager"""
+        self.last_updated = time.time() if now is None else now
+        self._status_cache = None
+        if self._on_change is not None:
+            self._on_change(self)
 
     def turn_on(self) -> str:
         """Turn device on"""
@@ -21,7 +73,7 @@ class SmartHomeDevice(ABC):
             return f"❌ {self.name} is offline"
 
         self.state["power"] = True
-        self.last_updated = datetime.now()
+        self._mark_changed()
         return f"✅ {self.name} turned on"
 
     def turn_off(self) -> str:
@@ -30,16 +82,34 @@ class SmartHomeDevice(ABC):
             return f"❌ {self.name} is offline"
 
         self.state["power"] = False
-        self.last_updated = datetime.now()
+        self._mark_changed()
         return f"🔌 {self.name} turned off"
 
     def toggle(self) -> str:
         """Toggle device power state"""
         return self.turn_off() if self.state.get("power") else self.turn_on()
 
-    @abstractmethod
+    def to_api_dict(self) -> Dict[str, Any]:
+        """Get the device fields exposed by the REST API"""
+        return {
+            "id": self.device_id,
+            "name": self.name,
+            "location": self.location,
+            "type": self.device_type,
+            "power": self.state["power"],
+            "online": self.is_online
+        }
+
     def get_status(self) -> str:
-        """Get device status - must be implemented by subclasses"""
+        """Get device status, re-rendered only after a state change"""
+        cached = self._status_cache
+        if cached is None or cached[0] != self.is_online:
+            cached = self._status_cache = (self.is_online, self._render_status())
+        return cached[1]
+
+    @abstractmethod
+    def _render_status(self) -> str:
+        """Format device status - must be implemented by subclasses"""
         pass
 
     def __str__(self) -> str:
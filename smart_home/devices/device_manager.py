@@ -1,5 +1,8 @@
 import logging
-from typing import Dict, List, Optional
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Set, Tuple
 from smart_home.config.app_config import my_config
 from smart_home.devices.lamp import SmartLamp
 from smart_home.devices.air_conditioner import SmartAirConditioner
@@ -7,6 +10,14 @@ from smart_home.devices.television import SmartTelevision
 
 logger = logging.getLogger(__name__)
 
+# Status report headers, in display order
+_STATUS_HEADER = "📊 Smart Home Status:"
+_STATUS_SECTIONS = (
+    ("lamp", "\n💡 Lamps:"),
+    ("ac", "\n❄️ Air Conditioners:"),
+    ("tv", "\n📺 Televisions:"),
+)
+
 
 class DeviceManager:
     """Manages all smart home devices"""
@@ -14,6 +25,13 @@ class DeviceManager:
     def __init__(self):
         """Initialize device manager with devices from config"""
         self.devices: Dict[str, object] = {}
+        self._by_type: Dict[str, List[object]] = {"lamp": [], "ac": [], "tv": []}
+        self._by_location: Dict[Tuple[str, str], object] = {}
+        self._version = 0
+        self._powered: Set[str] = set()
+        # Commands run on several API worker threads; re-entrant because device changes
+        # call back into _device_changed while control_device holds it
+        self._lock = threading.RLock()
         self._create_devices()
         logger.info(f"Created {len(self.devices)} devices")
 
@@ -21,33 +39,75 @@ class DeviceManager:
         """Create all devices from configuration"""
         # Create lamps
         for location in my_config.lamps:
-            device_id = f"{location.lower().replace(' ', '_')}_lamp"
-            self.devices[device_id] = SmartLamp(location)
+            self.add_device(SmartLamp(location))
 
         # Create ACs
         for location in my_config.acs:
-            device_id = f"{location.lower().replace(' ', '_')}_ac"
-            self.devices[device_id] = SmartAirConditioner(location)
+            self.add_device(SmartAirConditioner(location))
 
         # Create TVs
         for location in my_config.tvs:
-            device_id = f"{location.lower().replace(' ', '_')}_tv"
-            self.devices[device_id] = SmartTelevision(location)
+            self.add_device(SmartTelevision(location))
+
+    def add_device(self, device) -> None:
+        """Register a device and index it by type"""
+        with self._lock:
+            self.remove_device(device.device_id)
+            self.devices[device.device_id] = device
+            self._by_type.setdefault(device.device_type, []).append(device)
+            self._by_location[(self._location_key(device.location), device.device_type)] = device
+            device._on_change = self._device_changed
+            self._device_changed(device)
+
+    def remove_device(self, device_id: str) -> Optional[object]:
+        """Unregister a device and drop it from the type index"""
+        with self._lock:
+            device = self.devices.pop(device_id, None)
+            if device is not None:
+                self._by_type[device.device_type].remove(device)
+                self._by_location.pop((self._location_key(device.location), device.device_type), None)
+                device._on_change = None
+                self._powered.discard(device_id)
+                self._version += 1
+        return device
+
+    def _device_changed(self, device) -> None:
+        """Called by devices whenever their state changes"""
+        with self._lock:
+            self._version += 1
+            if device.state.get("power"):
+                self._powered.add(device.device_id)
+            else:
+                self._powered.discard(device.device_id)
+
+    @property
+    def state_version(self) -> int:
+        """Counter that changes whenever any device state changes"""
+        return self._version
+
+    @property
+    def powered_on_count(self) -> int:
+        """Number of devices currently powered on"""
+        return len(self._powered)
 
     def get_device(self, device_id: str) -> Optional[object]:
         """Get device by ID"""
         return self.devices.get(device_id)
 
     def get_devices_by_type(self, device_type: str) -> List[object]:
-        """Get all devices of specific type"""
-        return [device for device_id, device in self.devices.items()
-                if device_type in device_id]
+        """Get all devices of specific type (the live index list - don't modify it)"""
+        return self._by_type.get(device_type, [])
 
-    def get_all_devices(self) -> Dict[str, object]:
-        """Get all devices"""
-        return self.devices.copy()
+    def get_all_devices(self) -> Mapping[str, object]:
+        """Get a read-only view of all devices"""
+        return MappingProxyType(self.devices)
 
     def control_device(self, device_type: str, action: str, location: str = None, value: str = None) -> str:
+        """Control devices based on type and action (one command at a time)"""
+        with self._lock:
+            return self._control_device(device_type, action, location, value)
+
+    def _control_device(self, device_type: str, action: str, location: str = None, value: str = None) -> str:
         """Control devices based on type and action"""
         try:
             # Handle special device types
@@ -70,10 +130,14 @@ class DeviceManager:
             logger.error(f"Error controlling device: {e}")
             return f"❌ Error controlling device: {str(e)}"
 
+    @staticmethod
+    def _location_key(location: str) -> str:
+        """Normalize a location name ("Living_Room" -> "living room")"""
+        return location.strip().lower().replace("_", " ")
+
     def _get_device_by_pattern(self, device_type: str, location: str):
         """Get device by type and location pattern"""
-        device_id = f"{location.lower().replace(' ', '_')}_{device_type}"
-        return self.devices.get(device_id)
+        return self._by_location.get((self._location_key(location), device_type))
 
     def _control_all_lamps(self, action: str, value: str = None) -> str:
         """Control all lamps"""
@@ -94,71 +158,31 @@ class DeviceManager:
         if action != "off":
             return "❌ Only 'off' action is supported for all devices"
 
-        results = []
-        for device in self.devices.values():
-            result = device.turn_off()
-            if not result.startswith("❌"):
-                results.append(f"  • {result}")
+        return "🔌 All devices turned off:\n" + "\n".join(
+            [f"  • 🔌 {name} turned off" for name in self.bulk_power_off()]
+        )
 
-        return f"🔌 All devices turned off:\n" + "\n".join(results)
+    def bulk_power_off(self) -> List[str]:
+        """Turn off every online device in one sweep and return their names"""
+        now = time.time()
+        names = []
+        for device in self.devices.values():
+            if not device.is_online:
+                continue
+            if device.state.get("power"):
+                device.state["power"] = False
+                device._mark_changed(now)
+            names.append(device.name)
+        return names
 
     def _execute_device_action(self, device, action: str, value: str = None) -> str:
         """Execute action on a specific device"""
-        try:
-            # Basic actions
-            if action == "on":
-                return device.turn_on()
-            elif action == "off":
-                return device.turn_off()
-            elif action == "toggle":
-                return device.toggle()
-
-            # Lamp-specific actions
-            elif action == "brightness" and hasattr(device, 'set_brightness'):
-                if value:
-                    return device.set_brightness(int(value))
-                return "❌ Please specify brightness level (0-100)"
-
-            elif action == "color" and hasattr(device, 'set_color'):
-                if value:
-                    return device.set_color(value)
-                return "❌ Please specify a color"
-
-            # AC-specific actions
-            elif action == "temperature" and hasattr(device, 'set_temperature'):
-                if value:
-                    return device.set_temperature(int(value))
-                return "❌ Please specify temperature (16-30°C)"
-
-            elif action == "mode" and hasattr(device, 'set_mode'):
-                if value:
-                    return device.set_mode(value)
-                return "❌ Please specify mode"
-
-            elif action == "fan_speed" and hasattr(device, 'set_fan_speed'):
-                if value:
-                    return device.set_fan_speed(value)
-                return "❌ Please specify fan speed"
-
-            # TV-specific actions
-            elif action == "channel" and hasattr(device, 'set_channel'):
-                if value:
-                    return device.set_channel(int(value))
-                return "❌ Please specify channel number"
-
-            elif action == "volume" and hasattr(device, 'set_volume'):
-                if value:
-                    return device.set_volume(int(value))
-                return "❌ Please specify volume level"
-
-            elif action == "input" and hasattr(device, 'set_input'):
-                if value:
-                    return device.set_input(value)
-                return "❌ Please specify input"
-
-            else:
-                return f"❌ Action '{action}' not supported for {device.device_type}"
+        handler = device.ACTIONS.get(action)
+        if handler is None:
+            return f"❌ Action '{action}' not supported for {device.device_type}"
 
+        try:
+            return handler(device, value)
         except (ValueError, TypeError):
             return f"❌ Invalid value '{value}' for action '{action}'"
         except Exception as e:
@@ -168,27 +192,12 @@ class DeviceManager:
         """Get device status"""
         try:
             if device_name == "all":
-                status_lines = ["📊 Smart Home Status:"]
-
-                # Group by device type
-                lamp_devices = self.get_devices_by_type("lamp")
-                ac_devices = self.get_devices_by_type("ac")
-                tv_devices = self.get_devices_by_type("tv")
-
-                if lamp_devices:
-                    status_lines.append("\n💡 Lamps:")
-                    for device in lamp_devices:
-                        status_lines.append(f"  • {device.get_status()}")
-
-                if ac_devices:
-                    status_lines.append("\n❄️ Air Conditioners:")
-                    for device in ac_devices:
-                        status_lines.append(f"  • {device.get_status()}")
-
-                if tv_devices:
-                    status_lines.append("\n📺 Televisions:")
-                    for device in tv_devices:
-                        status_lines.append(f"  • {device.get_status()}")
+                status_lines = [_STATUS_HEADER]
+                for device_type, section_header in _STATUS_SECTIONS:
+                    devices = self._by_type.get(device_type)
+                    if devices:
+                        status_lines.append(section_header)
+                        status_lines.extend([f"  • {device.get_status()}" for device in devices])
 
                 return "\n".join(status_lines)
             else:
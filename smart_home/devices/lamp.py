@@ -1,15 +1,29 @@
-from datetime import datetime
-from typing import List
-from smart_home.devices.base_device import SmartHomeDevice
+from typing import Any, Dict, List
+from smart_home.devices.base_device import SmartHomeDevice, as_int, value_action
+
+# Display order for colors; the class validates against a set built from this
+COLORS = ("white", "red", "blue", "green", "yellow", "purple", "orange")
+COLOR_EMOJIS = {
+    "white": "⚪", "red": "🔴", "blue": "🔵", "green": "🟢",
+    "yellow": "🟡", "purple": "🟣", "orange": "🟠"
+}
+DEFAULT_EMOJI = "💡"
 
 
 class SmartLamp(SmartHomeDevice):
     """Smart Lamp with brightness and color control"""
 
-    VALID_COLORS = ["white", "red", "blue", "green", "yellow", "purple", "orange"]
-    COLOR_EMOJIS = {
-        "white": "⚪", "red": "🔴", "blue": "🔵", "green": "🟢",
-        "yellow": "🟡", "purple": "🟣", "orange": "🟠"
+    __slots__ = ()
+
+    VALID_COLORS = frozenset(COLORS)
+    INVALID_COLOR_MESSAGE = f"❌ Invalid color. Available: {', '.join(COLORS)}"
+    COLOR_EMOJIS = COLOR_EMOJIS
+
+    ACTIONS = {
+        **SmartHomeDevice.ACTIONS,
+        "brightness": value_action(lambda device, value: device.set_brightness(value),
+                                   "❌ Please specify brightness level (0-100)"),
+        "color": value_action(lambda device, value: device.set_color(value), "❌ Please specify a color"),
     }
 
     def __init__(self, location: str, default_brightness: int = 100, default_color: str = "white"):
@@ -28,20 +42,21 @@ class SmartLamp(SmartHomeDevice):
         if not self.state.get("power"):
             return f"❌ {self.name} is off. Turn it on first"
 
-        try:
-            level = max(0, min(100, int(level)))
+        level = as_int(level)
+        if level is None:
+            return f"❌ Invalid brightness value. Please use 0-100"
 
-            if level == 0:
-                self.state["brightness"] = 0
-                self.state["power"] = False
-                return f"🌙 {self.name} dimmed to 0% (turned off)"
+        level = max(0, min(100, level))
 
-            self.state["brightness"] = level
-            self.last_updated = datetime.now()
-            return f"💡 {self.name} brightness set to {level}%"
+        if level == 0:
+            self.state["brightness"] = 0
+            self.state["power"] = False
+            self._mark_changed()
+            return f"🌙 {self.name} dimmed to 0% (turned off)"
 
-        except (ValueError, TypeError):
-            return f"❌ Invalid brightness value. Please use 0-100"
+        self.state["brightness"] = level
+        self._mark_changed()
+        return f"💡 {self.name} brightness set to {level}%"
 
     def set_color(self, color: str) -> str:
         """Set lamp color with validation"""
@@ -51,30 +66,39 @@ class SmartLamp(SmartHomeDevice):
         if not self.state.get("power"):
             return f"❌ {self.name} is off. Turn it on first"
 
-        color_normalized = color.lower().strip()
+        color_normalized = color if color in self.VALID_COLORS else color.lower().strip()
 
         if color_normalized in self.VALID_COLORS:
             self.state["color"] = color_normalized
-            self.last_updated = datetime.now()
-            emoji = self.COLOR_EMOJIS.get(color_normalized, "💡")
+            self._mark_changed()
+            emoji = COLOR_EMOJIS.get(color_normalized, DEFAULT_EMOJI)
             return f"{emoji} {self.name} color changed to {color_normalized}"
 
-        return f"❌ Invalid color. Available: {', '.join(self.VALID_COLORS)}"
+        return self.INVALID_COLOR_MESSAGE
+
+    def to_api_dict(self) -> Dict[str, Any]:
+        """Get lamp fields exposed by the REST API"""
+        info = super().to_api_dict()
+        info["brightness"] = self.state["brightness"]
+        info["color"] = self.state["color"]
+        return info
 
-    def get_status(self) -> str:
+    def _render_status(self) -> str:
         """Get formatted lamp status"""
         if not self.is_online:
             return f"{self.name} ({self.location}): OFFLINE 🔴"
 
-        if self.state.get("power"):
-            color_emoji = self.COLOR_EMOJIS.get(self.state.get("color"), "💡")
+        # Keys are always present - set in __init__
+        state = self.state
+        if state["power"]:
+            color = state["color"]
             return (f"{self.name} ({self.location}): ON 🟢 - "
-                    f"{self.state.get('brightness')}% brightness "
-                    f"{color_emoji} {self.state.get('color')} color")
+                    f"{state['brightness']}% brightness "
+                    f"{COLOR_EMOJIS.get(color, DEFAULT_EMOJI)} {color} color")
 
         return f"{self.name} ({self.location}): OFF 🔴"
 
     @classmethod
     def get_valid_colors(cls) -> List[str]:
         """Get list of valid colors"""
-        return cls.VALID_COLORS.copy()
+        return list(COLORS)
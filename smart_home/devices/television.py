@@ -1,20 +1,44 @@
-from datetime import datetime
-from typing import List
-from smart_home.devices.base_device import SmartHomeDevice
+from typing import Any, Dict, List
+from smart_home.devices.base_device import SmartHomeDevice, as_int, value_action
+
+# Display order for inputs; the class validates against a set built from this
+INPUTS = ("hdmi1", "hdmi2", "hdmi3", "usb", "cable", "antenna", "netflix", "youtube")
+INPUT_EMOJIS = {
+    "hdmi1": "🔌", "hdmi2": "🔌", "hdmi3": "🔌", "usb": "🔌",
+    "cable": "📡", "antenna": "📡", "netflix": "🎬", "youtube": "📹"
+}
+DEFAULT_EMOJI = "📺"
+
+# Indexed by (volume > 0) + (volume > 30) + (volume > 70)
+_VOLUME_EMOJIS = ("🔇", "🔈", "🔉", "🔊")
+
+
+def volume_emoji(volume: int) -> str:
+    """Get emoji for a volume level"""
+    return _VOLUME_EMOJIS[(volume > 0) + (volume > 30) + (volume > 70)]
 
 
 class SmartTelevision(SmartHomeDevice):
     """Smart TV with channel, volume, and input control"""
 
+    __slots__ = ()
+
     MIN_CHANNEL = 1
     MAX_CHANNEL = 999
     MIN_VOLUME = 0
     MAX_VOLUME = 100
 
-    VALID_INPUTS = ["hdmi1", "hdmi2", "hdmi3", "usb", "cable", "antenna", "netflix", "youtube"]
-    INPUT_EMOJIS = {
-        "hdmi1": "🔌", "hdmi2": "🔌", "hdmi3": "🔌", "usb": "🔌",
-        "cable": "📡", "antenna": "📡", "netflix": "🎬", "youtube": "📹"
+    VALID_INPUTS = frozenset(INPUTS)
+    INVALID_INPUT_MESSAGE = f"❌ Invalid input. Available: {', '.join(INPUTS)}"
+    INPUT_EMOJIS = INPUT_EMOJIS
+
+    ACTIONS = {
+        **SmartHomeDevice.ACTIONS,
+        "channel": value_action(lambda device, value: device.set_channel(value),
+                                "❌ Please specify channel number"),
+        "volume": value_action(lambda device, value: device.set_volume(value),
+                               "❌ Please specify volume level"),
+        "input": value_action(lambda device, value: device.set_input(value), "❌ Please specify input"),
     }
 
     def __init__(self, location: str, default_volume: int = 50, default_channel: int = 1):
@@ -34,15 +58,15 @@ class SmartTelevision(SmartHomeDevice):
         if not self.state.get("power"):
             return f"❌ {self.name} is off. Turn it on first"
 
-        try:
-            channel = max(self.MIN_CHANNEL, min(self.MAX_CHANNEL, int(channel)))
-            self.state["channel"] = channel
-            self.last_updated = datetime.now()
-            return f"📺 {self.name} channel changed to {channel}"
-
-        except (ValueError, TypeError):
+        channel = as_int(channel)
+        if channel is None:
             return f"❌ Invalid channel. Please use {self.MIN_CHANNEL}-{self.MAX_CHANNEL}"
 
+        channel = max(self.MIN_CHANNEL, min(self.MAX_CHANNEL, channel))
+        self.state["channel"] = channel
+        self._mark_changed()
+        return f"📺 {self.name} channel changed to {channel}"
+
     def set_volume(self, volume: int) -> str:
         """Set TV volume with validation"""
         if not self.is_online:
@@ -51,16 +75,15 @@ class SmartTelevision(SmartHomeDevice):
         if not self.state.get("power"):
             return f"❌ {self.name} is off. Turn it on first"
 
-        try:
-            volume = max(self.MIN_VOLUME, min(self.MAX_VOLUME, int(volume)))
-            self.state["volume"] = volume
-            self.last_updated = datetime.now()
+        volume = as_int(volume)
+        if volume is None:
+            return f"❌ Invalid volume. Please use {self.MIN_VOLUME}-{self.MAX_VOLUME}"
 
-            emoji = "🔇" if volume == 0 else "🔈" if volume <= 30 else "🔉" if volume <= 70 else "🔊"
-            return f"{emoji} {self.name} volume set to {volume}"
+        volume = max(self.MIN_VOLUME, min(self.MAX_VOLUME, volume))
+        self.state["volume"] = volume
+        self._mark_changed()
 
-        except (ValueError, TypeError):
-            return f"❌ Invalid volume. Please use {self.MIN_VOLUME}-{self.MAX_VOLUME}"
+        return f"{volume_emoji(volume)} {self.name} volume set to {volume}"
 
     def set_input(self, input_source: str) -> str:
         """Set TV input with validation"""
@@ -70,29 +93,38 @@ class SmartTelevision(SmartHomeDevice):
         if not self.state.get("power"):
             return f"❌ {self.name} is off. Turn it on first"
 
-        input_normalized = input_source.lower().strip()
+        input_normalized = input_source if input_source in self.VALID_INPUTS else input_source.lower().strip()
 
         if input_normalized in self.VALID_INPUTS:
             self.state["input"] = input_normalized
-            self.last_updated = datetime.now()
-            emoji = self.INPUT_EMOJIS.get(input_normalized, "📺")
+            self._mark_changed()
+            emoji = INPUT_EMOJIS.get(input_normalized, DEFAULT_EMOJI)
             return f"{emoji} {self.name} input changed to {input_normalized}"
 
-        return f"❌ Invalid input. Available: {', '.join(self.VALID_INPUTS)}"
+        return self.INVALID_INPUT_MESSAGE
+
+    def to_api_dict(self) -> Dict[str, Any]:
+        """Get TV fields exposed by the REST API"""
+        info = super().to_api_dict()
+        info["channel"] = self.state["channel"]
+        info["volume"] = self.state["volume"]
+        info["input"] = self.state["input"]
+        return info
 
-    def get_status(self) -> str:
+    def _render_status(self) -> str:
         """Get formatted TV status"""
         if not self.is_online:
             return f"{self.name} ({self.location}): OFFLINE 🔴"
 
-        if self.state.get("power"):
-            volume = self.state.get("volume", 50)
-            volume_emoji = "🔇" if volume == 0 else "🔈" if volume <= 30 else "🔉" if volume <= 70 else "🔊"
-            input_emoji = self.INPUT_EMOJIS.get(self.state.get("input"), "📺")
+        # Keys are always present - set in __init__
+        state = self.state
+        if state["power"]:
+            volume = state["volume"]
+            input_source = state["input"]
 
             return (f"{self.name} ({self.location}): ON 🟢 - "
-                    f"Channel {self.state.get('channel')} 📺, "
-                    f"Volume {volume} {volume_emoji}, "
-                    f"Input: {self.state.get('input')} {input_emoji}")
+                    f"Channel {state['channel']} 📺, "
+                    f"Volume {volume} {volume_emoji(volume)}, "
+                    f"Input: {input_source} {INPUT_EMOJIS.get(input_source, DEFAULT_EMOJI)}")
 
         return f"{self.name} ({self.location}): OFF 🔴"
@@ -1,17 +1,113 @@
+import os
+import threading
 import time
 import sys
-from typing import Optional
-from smart_home.core.assistant import SmartHomeAssistant
+import textwrap
+from collections import deque
+from itertools import cycle, islice
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from smart_home.core.assistant import SmartHomeAssistant
+
+_CLEAR_SCREEN = "\x1b[2J\x1b[H"  # erase display, cursor home
+
+# Same width, so each frame fully overwrites the previous one
+_PROCESSING_FRAMES = ("\r🤔 Processing   ", "\r🤔 Processing.  ", "\r🤔 Processing.. ", "\r🤔 Processing...")
+_PROCESSING_CLEAR = "\r" + " " * 20 + "\r"
+_EXIT_COMMANDS = frozenset({'quit', 'exit', 'bye', 'خروج', 'بای', 'خداحافظ'})
+
+# Static screens, each written with a single call
+_BORDER = "🎭" + "=" * 58 + "🎭"
+_WELCOME = f"""
+{_BORDER}
+           SMART HOME ASSISTANT - TEXT CHAT
+{_BORDER}
+🌍 Automatic Language Detection: English + Persian
+🤖 Powered by LLaMA 3.3 70B with Function Calling
+📱 Connected to your smart home devices
+{_BORDER}
+"""
+
+_QUICK_START_FOOTER = f"""
+💡 Special Commands:
+   • 'help' - Show all commands
+   • 'status' - Show device status
+   • 'history' - Show conversation history
+   • 'clear' - Clear screen
+   • 'quit' / 'خروج' - Exit to main menu
+
+{"-" * 60}
+"""
+
+_HELP = f"""
+📚 SMART HOME ASSISTANT - HELP
+{"=" * 50}
+
+🏠 Device Control:
+   • Turn on/off: 'Turn on kitchen lamp' / 'چراغ آشپزخانه را روشن کن'
+   • Brightness: 'Set lamp to 70%' / 'چراغ را روی ۷۰ درصد تنظیم کن'
+   • Temperature: 'Set AC to 22 degrees' / 'کولر را روی ۲۲ درجه تنظیم کن'
+   • TV Control: 'Turn on TV' / 'تلویزیون را روشن کن'
+   • All devices: 'Turn off all devices' / 'همه دستگاه‌ها را خاموش کن'
+
+🌐 Information Services:
+   • Weather: 'What's the weather?' / 'هوا چطوره؟'
+   • News: 'Get technology news' / 'خبرهای فناوری بده'
+   • Time: 'What time is it?' / 'ساعت چنده؟'
+
+💬 CLI Commands:
+   • help - Show this help
+   • status - Show device status
+   • history - Show conversation history
+   • examples - Show more examples
+   • test - Test all services
+   • clear - Clear screen
+   • quit - Return to main menu
+
+🎯 Tips:
+   • Commands work in both English and Persian
+   • Language is detected automatically
+   • Use natural language - be conversational!
+"""
+
+_ADVANCED_EXAMPLES = """
+💡 Advanced Examples:
+   • 'Set kitchen lamp to blue color at 80% brightness'
+   • 'Turn on AC in room 1 with cool mode and low fan speed'
+   • 'What's the weather in Paris and set AC accordingly'
+   • 'چراغ حمام را قرمز کن و روشنی‌اش را ۵۰ درصد تنظیم کن'
+"""
+
+
+def _write(text: str):
+    """Write a block of text to stdout in one call"""
+    sys.stdout.write(text)
+    sys.stdout.flush()
 
 
 class CLIInterface:
     """Enhanced command line interface for Smart Home Assistant"""
 
-    def __init__(self, assistant: SmartHomeAssistant):
+    _vt_enabled = False
+
+    def __init__(self, assistant: "SmartHomeAssistant"):
         """Initialize CLI interface"""
         self.assistant = assistant
-        self.conversation_history = []
         self.max_history = 10
+        self.conversation_history = deque(maxlen=self.max_history)  # oldest entries drop off automatically
+        self._examples_cache = None
+
+        # Special command -> handler
+        self._special_commands = {
+            'help': self._show_help,
+            'status': self._show_device_status,
+            'history': self._show_conversation_history,
+            'clear': self._clear_screen,
+            'test': self._run_service_test,
+            'examples': self._show_more_examples,
+        }
+        self._max_special_length = max(len(command) for command in (*self._special_commands, *_EXIT_COMMANDS))
 
     def run(self):
         """Run the enhanced CLI interface"""
@@ -39,34 +135,24 @@ class CLIInterface:
 
     def _show_welcome(self):
         """Show enhanced welcome message"""
-        print("\n" + "🎭" + "=" * 58 + "🎭")
-        print("           SMART HOME ASSISTANT - TEXT CHAT")
-        print("🎭" + "=" * 58 + "🎭")
-        print("🌍 Automatic Language Detection: English + Persian")
-        print("🤖 Powered by LLaMA 3.3 70B with Function Calling")
-        print("📱 Connected to your smart home devices")
-        print("🎭" + "=" * 58 + "🎭")
+        _write(_WELCOME)
+
+    def _examples(self) -> dict:
+        """Get example commands, fetched once per session"""
+        if self._examples_cache is None:
+            self._examples_cache = self.assistant.get_example_commands()
+        return self._examples_cache
 
     def _show_quick_start(self):
         """Show quick start guide"""
-        examples = self.assistant.get_example_commands()
-
-        print("\n🚀 QUICK START - Try these commands:")
-        print("\n🇺🇸 English Examples:")
-        for i, cmd in enumerate(examples["english"][:3], 1):
-            print(f"   {i}. {cmd}")
-
-        print("\n🇮🇷 Persian Examples:")
-        for i, cmd in enumerate(examples["persian"][:3], 1):
-            print(f"   {i}. {cmd}")
+        examples = self._examples()
 
-        print("\n💡 Special Commands:")
-        print("   • 'help' - Show all commands")
-        print("   • 'status' - Show device status")
-        print("   • 'history' - Show conversation history")
-        print("   • 'clear' - Clear screen")
-        print("   • 'quit' / 'خروج' - Exit to main menu")
-        print("\n" + "-" * 60)
+        parts = ["\n🚀 QUICK START - Try these commands:\n\n🇺🇸 English Examples:\n"]
+        parts.extend([f"   {i}. {cmd}\n" for i, cmd in enumerate(examples["english"][:3], 1)])
+        parts.append("\n🇮🇷 Persian Examples:\n")
+        parts.extend([f"   {i}. {cmd}\n" for i, cmd in enumerate(examples["persian"][:3], 1)])
+        parts.append(_QUICK_START_FOOTER)
+        _write("".join(parts))
 
     def _get_user_input(self) -> str:
         """Get user input with enhanced prompt"""
@@ -80,86 +166,74 @@ class CLIInterface:
 
     def _handle_special_commands(self, user_input: str) -> bool:
         """Handle special CLI commands"""
+        # Ordinary requests are longer than any special command - don't bother lowercasing them
+        if len(user_input) > self._max_special_length:
+            return False
+
         command = user_input.lower()
 
-        if command in ['quit', 'exit', 'bye', 'خروج', 'بای', 'خداحافظ']:
+        if command in _EXIT_COMMANDS:
             self._handle_exit()
             return True
 
-        elif command == 'help':
-            self._show_help()
-            return True
-
-        elif command == 'status':
-            self._show_device_status()
-            return True
-
-        elif command == 'history':
-            self._show_conversation_history()
-            return True
-
-        elif command == 'clear':
-            self._clear_screen()
-            return True
-
-        elif command == 'test':
-            self._run_service_test()
-            return True
-
-        elif command == 'examples':
-            self._show_more_examples()
+        handler = self._special_commands.get(command)
+        if handler is not None:
+            handler()
             return True
 
         return False
 
     def _process_and_display_command(self, user_input: str):
         """Process command and display response with enhancements"""
-        # Show processing indicator
-        self._show_processing_indicator()
+        # Animate while waiting, but only until the first chunk of the answer arrives
+        stop_indicator = threading.Event()
+        indicator = threading.Thread(target=self._show_processing_indicator, args=(stop_indicator,), daemon=True)
+        indicator.start()
 
-        # Process command
+        # Process command, printing the response as it streams in
         start_time = time.time()
-        response = self.assistant.process_command(user_input)
+        parts = []
+        try:
+            for piece in self.assistant.stream_command(user_input):
+                if not parts:
+                    self._stop_processing_indicator(stop_indicator, indicator)
+                    print("🤖 Assistant / دستیار:")
+                parts.append(piece)
+                sys.stdout.write(piece)
+                sys.stdout.flush()
+        finally:
+            self._stop_processing_indicator(stop_indicator, indicator)
+
+        response = "".join(parts)
         processing_time = time.time() - start_time
+        print()
+        print(f"⏱️  Processed in {processing_time:.2f}s")
 
         # Add to conversation history
         self._add_to_history(user_input, response)
 
-        # Display response with formatting
-        self._display_response(response, processing_time)
-
-    def _show_processing_indicator(self):
-        """Show animated processing indicator"""
-        indicators = ["🤔 Processing", "🤔 Processing.", "🤔 Processing..", "🤔 Processing..."]
-        for indicator in indicators:
-            print(f"\r{indicator}", end="", flush=True)
-            time.sleep(0.3)
-        print("\r" + " " * 20 + "\r", end="", flush=True)  # Clear line
-
-    def _display_response(self, response: str, processing_time: float):
-        """Display response with enhanced formatting"""
-        print("🤖 Assistant / دستیار:")
-        print(response)
-        print(f"⏱️  Processed in {processing_time:.2f}s")
+    def _show_processing_indicator(self, stop_event: threading.Event):
+        """Show animated processing indicator until stop_event is set"""
+        write = sys.stdout.write
+        flush = sys.stdout.flush
+        for frame in cycle(_PROCESSING_FRAMES):
+            write(frame)
+            flush()
+            if stop_event.wait(0.3):
+                break
+        write(_PROCESSING_CLEAR)
+        flush()
+
+    def _stop_processing_indicator(self, stop_event: threading.Event, thread: threading.Thread):
+        """Stop the processing indicator and wait for it to clear its line"""
+        if not stop_event.is_set():
+            stop_event.set()
+            thread.join()
 
     def _wrap_text(self, text: str, width: int) -> list:
         """Wrap text to specified width"""
-        words = text.split()
-        lines = []
-        current_line = ""
-
-        for word in words:
-            if len(current_line + " " + word) <= width:
-                current_line += (" " + word) if current_line else word
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-
-        if current_line:
-            lines.append(current_line)
-
-        return lines or [""]
+        # Like the old word loop: overlong words stay whole, hyphens aren't break points
+        return textwrap.wrap(text, width=width, break_long_words=False, break_on_hyphens=False) or [""]
 
     def _add_to_history(self, user_input: str, response: str):
         """Add interaction to conversation history"""
@@ -169,40 +243,9 @@ class CLIInterface:
             "response": response
         })
 
-        # Keep only recent conversations
-        if len(self.conversation_history) > self.max_history:
-            self.conversation_history.pop(0)
-
     def _show_help(self):
         """Show comprehensive help"""
-        print("\n📚 SMART HOME ASSISTANT - HELP")
-        print("=" * 50)
-
-        print("\n🏠 Device Control:")
-        print("   • Turn on/off: 'Turn on kitchen lamp' / 'چراغ آشپزخانه را روشن کن'")
-        print("   • Brightness: 'Set lamp to 70%' / 'چراغ را روی ۷۰ درصد تنظیم کن'")
-        print("   • Temperature: 'Set AC to 22 degrees' / 'کولر را روی ۲۲ درجه تنظیم کن'")
-        print("   • TV Control: 'Turn on TV' / 'تلویزیون را روشن کن'")
-        print("   • All devices: 'Turn off all devices' / 'همه دستگاه‌ها را خاموش کن'")
-
-        print("\n🌐 Information Services:")
-        print("   • Weather: 'What's the weather?' / 'هوا چطوره؟'")
-        print("   • News: 'Get technology news' / 'خبرهای فناوری بده'")
-        print("   • Time: 'What time is it?' / 'ساعت چنده؟'")
-
-        print("\n💬 CLI Commands:")
-        print("   • help - Show this help")
-        print("   • status - Show device status")
-        print("   • history - Show conversation history")
-        print("   • examples - Show more examples")
-        print("   • test - Test all services")
-        print("   • clear - Clear screen")
-        print("   • quit - Return to main menu")
-
-        print("\n🎯 Tips:")
-        print("   • Commands work in both English and Persian")
-        print("   • Language is detected automatically")
-        print("   • Use natural language - be conversational!")
+        _write(_HELP)
 
     def _show_device_status(self):
         """Show current device status"""
@@ -220,7 +263,8 @@ class CLIInterface:
             print("No conversation history yet.")
             return
 
-        for i, conv in enumerate(self.conversation_history[-5:], 1):
+        recent = islice(self.conversation_history, max(0, len(self.conversation_history) - 5), None)
+        for i, conv in enumerate(recent, 1):
             timestamp = time.strftime("%H:%M:%S", time.localtime(conv["timestamp"]))
             print(f"\n{i}. [{timestamp}]")
             print(f"   You: {conv['user_input']}")
@@ -234,33 +278,29 @@ class CLIInterface:
 
         test_results = self.assistant.test_services()
         for service, result in test_results.items():
-            print(f"{service.capitalize()}: {result}")
+            message = result[1] if isinstance(result, tuple) else result
+            print(f"{service.capitalize()}: {message}")
 
     def _show_more_examples(self):
         """Show comprehensive examples"""
-        examples = self.assistant.get_example_commands()
-
-        print("\n🎯 Comprehensive Command Examples:")
-        print("=" * 50)
+        examples = self._examples()
 
-        print("\n🇺🇸 English Commands:")
-        for i, cmd in enumerate(examples["english"], 1):
-            print(f"   {i}. {cmd}")
-
-        print("\n🇮🇷 Persian Commands:")
-        for i, cmd in enumerate(examples["persian"], 1):
-            print(f"   {i}. {cmd}")
-
-        print("\n💡 Advanced Examples:")
-        print("   • 'Set kitchen lamp to blue color at 80% brightness'")
-        print("   • 'Turn on AC in room 1 with cool mode and low fan speed'")
-        print("   • 'What's the weather in Paris and set AC accordingly'")
-        print("   • 'چراغ حمام را قرمز کن و روشنی‌اش را ۵۰ درصد تنظیم کن'")
+        parts = ["\n🎯 Comprehensive Command Examples:\n", "=" * 50, "\n\n🇺🇸 English Commands:\n"]
+        parts.extend([f"   {i}. {cmd}\n" for i, cmd in enumerate(examples["english"], 1)])
+        parts.append("\n🇮🇷 Persian Commands:\n")
+        parts.extend([f"   {i}. {cmd}\n" for i, cmd in enumerate(examples["persian"], 1)])
+        parts.append(_ADVANCED_EXAMPLES)
+        _write("".join(parts))
 
     def _clear_screen(self):
         """Clear the screen"""
-        import os
-        os.system('cls' if os.name == 'nt' else 'clear')
+        if os.name == 'nt' and not CLIInterface._vt_enabled:
+            # An empty system() call switches the Windows console into VT mode once
+            os.system('')
+            CLIInterface._vt_enabled = True
+
+        sys.stdout.write(_CLEAR_SCREEN)
+        sys.stdout.flush()
         self._show_welcome()
 
     def _handle_exit(self):
@@ -0,0 +1,341 @@
+import sys
+import os
+import logging
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, List
+
+# Repository root (smart_home/interfaces/main_menu.py -> three levels up), where .env lives
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if TYPE_CHECKING:
+    # Imported in main() once the banner is up - it pulls in the whole LLM stack
+    from smart_home.core.assistant import SmartHomeAssistant
+
+logger = logging.getLogger(__name__)
+
+# Voice stack modules (any one of a tuple will do) and the packages that provide them
+VOICE_DEPENDENCIES = {
+    ("faster_whisper", "whisper"): "faster-whisper",
+    ("sounddevice",): "sounddevice",
+    ("pygame",): "pygame",
+    ("numpy",): "numpy",
+    ("gtts",): "gtts",
+}
+
+
+# Kept across menu visits so the Whisper model is only loaded once
+_voice_interface = None
+
+
+def missing_voice_dependencies() -> List[str]:
+    """Find missing voice packages without importing them (torch, PortAudio and SDL load slowly)"""
+    return [
+        package for modules, package in VOICE_DEPENDENCIES.items()
+        if all(find_spec(module) is None for module in modules)
+    ]
+
+
+# Static screens, built once and written in a single call
+_BANNER = (
+    "\n🚀 SMART HOME ASSISTANT\n"
+    + "=" * 50 + "\n"
+    "🌍 Multilingual (English + Persian)\n"
+    "🤖 LLM-Powered with Function Calling\n"
+    "🎤 Voice + Text Interfaces\n"
+    + "=" * 50 + "\n"
+)
+
+_MENU = (
+    "\n🎯 Choose an interface:\n"
+    "1. 💬 Enhanced Text Chat (CLI)\n"
+    "2. 🎤 Voice Interface (with wake words)\n"
+    "3. 🚀 Quick Text Chat (Simple)\n"
+    "4. 📊 System Status & Test\n"
+    "5. 🧪 Test All Services\n"
+    "6. ❌ Exit\n"
+)
+
+
+_BANNER_BYTES = _BANNER.encode("utf-8")
+_MENU_BYTES = _MENU.encode("utf-8")
+
+
+def _write_static(text: str, data: bytes):
+    """Write a pre-encoded screen straight to stdout's file descriptor"""
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        # Captured or replaced stdout (tests, IDE consoles) - use the text layer
+        fd = None
+
+    if fd is None or (sys.stdout.encoding or "").lower() not in ("utf-8", "utf8"):
+        sys.stdout.write(text)
+        return
+
+    sys.stdout.flush()  # keep ordering with earlier buffered prints
+    os.write(fd, data)
+
+
+def show_banner():
+    """Show application banner"""
+    _write_static(_BANNER, _BANNER_BYTES)
+
+
+def show_menu_options():
+    """Print the main menu options"""
+    _write_static(_MENU, _MENU_BYTES)
+
+
+def show_menu() -> str:
+    """Show main menu and get user choice"""
+    show_menu_options()
+    sys.stdout.write("\nSelect option (1-6): ")
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.strip()
+
+
+def run_cli(assistant: "SmartHomeAssistant"):
+    """Run CLI interface from command_line_interface.py"""
+    print("\n💬 Starting CLI Interface...")
+    print("🌟 Features: Formatted output, history, animations, help system")
+
+    try:
+        from smart_home.interfaces.command_line_interface import CLIInterface
+
+        cli = CLIInterface(assistant)
+        cli.run()
+    except Exception as e:
+        logger.error("Enhanced CLI error: %s", e)
+        print(f"❌ Enhanced CLI error: {e}")
+
+
+def run_voice_interface(assistant: "SmartHomeAssistant"):
+    """Run voice interface with comprehensive error handling"""
+    print("\n🎤 Starting Voice Interface...")
+
+    missing_deps = missing_voice_dependencies()
+    if missing_deps:
+        print("❌ Missing voice dependencies:")
+        for dep in missing_deps:
+            print(f"   • {dep}")
+        print(f"\n💡 Install with: pip install {' '.join(missing_deps)}")
+        return
+
+    global _voice_interface
+
+    try:
+        # Import and run voice interface
+        from smart_home.interfaces.voice_interface import VoiceInterface
+
+        if _voice_interface is None or _voice_interface.assistant is not assistant:
+            print("🔄 Initializing voice components...")
+            _voice_interface = VoiceInterface(assistant)
+
+        print("✅ Voice interface ready!")
+        print(f"💡 Say '{_voice_interface.wake_words[0].capitalize()}' followed by your command")
+        print("💡 Press Ctrl+C to stop")
+
+        _voice_interface.run()
+
+    except ImportError as e:
+        print(f"\n❌ Voice interface module not found:")
+        print(f"Error: {e}")
+        print("\n💡 Make sure voice_interface.py is in smart_home/interfaces/")
+    except Exception as e:
+        logger.error("Voice interface error: %s", e)
+        print(f"❌ Voice interface error: {e}")
+
+
+def run_simple_text_chat(assistant: "SmartHomeAssistant"):
+    """Run simple text-based chat interface"""
+    print("\n💬 Simple Text Chat Interface Started!")
+    print("🌍 Automatic language detection (English + Persian)")
+
+    # Show example commands
+    examples = assistant.get_example_commands()
+    print("\n🎯 Example commands:")
+    print("English:")
+    for cmd in examples["english"][:3]:
+        print(f"  • {cmd}")
+    print("Persian:")
+    for cmd in examples["persian"][:3]:
+        print(f"  • {cmd}")
+
+    print("\n💡 Type 'quit', 'exit', or 'خروج' to return to menu")
+    print("-" * 60)
+
+    while True:
+        try:
+            user_input = input("\n🎤 You / شما: ").strip()
+
+            # Check for exit commands
+            if user_input.lower() in ['quit', 'exit', 'bye', 'خروج', 'بای', 'خداحافظ']:
+                print("👋 Returning to main menu...")
+                break
+
+            if not user_input:
+                continue
+
+            # Process command
+            print("🤔 Processing...")
+            response = assistant.process_command(user_input)
+            print(f"🤖 Assistant / دستیار: {response}")
+
+        except KeyboardInterrupt:
+            print("\n👋 Returning to main menu...")
+            break
+        except Exception as e:
+            logger.error("Error in simple chat: %s", e)
+            print(f"❌ Error: {e}")
+
+
+def show_system_status(assistant: "SmartHomeAssistant"):
+    """Show comprehensive system status"""
+    print("\n📊 System Status:")
+    print("=" * 50)
+
+    status = assistant.get_system_status()
+
+    # Device information
+    print(f"🏠 Devices: {status['total_devices']} total, {status['powered_on']} powered on")
+    device_types = status['device_types']
+    print(f"   💡 Lamps: {device_types['lamps']}")
+    print(f"   ❄️  ACs: {device_types['acs']}")
+    print(f"   📺 TVs: {device_types['tvs']}")
+
+    # Services status
+    print(f"\n🌐 Services:")
+    services = status['services']
+    for service_name, service_status in services.items():
+        print(f"   {service_name.capitalize()}: {service_status}")
+
+    # Language support
+    languages = ", ".join(status['languages'])
+    print(f"\n🌍 Languages: {languages}")
+
+    # Configuration
+    config_info = status['configuration']
+    print(f"\n⚙️  Configuration:")
+    print(f"   Default City: {config_info['default_city']}")
+    print(f"   Debug Mode: {config_info['debug_mode']}")
+    print(f"   Log Level: {config_info['log_level']}")
+
+    # Show device status
+    print(f"\n📱 Current Device Status:")
+    device_status = assistant.get_device_status()
+    print(device_status)
+
+
+def test_all_services(assistant: "SmartHomeAssistant"):
+    """Test all services"""
+    print("\n🧪 Testing All Services...")
+    print("=" * 50)
+
+    test_results = assistant.test_services()
+
+    for service_name, result in test_results.items():
+        # (ok, message) tuples; plain strings from older assistants still work
+        ok, message = result if isinstance(result, tuple) else (result.startswith("✅"), result)
+        print(f"{'✅' if ok else '❌'} {service_name.capitalize()}: {message}")
+
+    print("\n💡 If any services show errors:")
+    print("   • Check your .env file for API keys")
+    print("   • Verify internet connection")
+    print("   • Check logs for detailed error messages")
+
+
+def check_environment():
+    """Check if environment is properly configured"""
+    print("🔍 Checking environment...")
+
+    # Key already in the process environment (containers, systemd) - no .env needed
+    groq_key = os.environ.get("GROQ_API_KEY")
+    if not groq_key:
+        # Check for .env file
+        env_file = os.path.join(project_root, '.env')
+        if not os.path.exists(env_file):
+            print("⚠️  .env file not found")
+            print("💡 Create .env file with your API keys (copy from .env.example)")
+            return False
+
+        from dotenv import load_dotenv
+        load_dotenv()
+        groq_key = os.environ.get("GROQ_API_KEY")
+
+    # Check for GROQ_API_KEY
+    if not groq_key or groq_key == "your_groq_api_key_here":
+        print("⚠️  GROQ_API_KEY not configured")
+        print("💡 Add your Groq API key to .env file")
+        print("💡 Get free key from: https://console.groq.com")
+        return False
+
+    print("✅ Environment looks good!")
+    return True
+
+
+def main():
+    """Main application entry point"""
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    show_banner()
+
+    if "--help" in sys.argv or "-h" in sys.argv:
+        print("\nUsage: python run_smart_home.py")
+        print("Starts the assistant and shows this menu:")
+        show_menu_options()
+        return
+
+    # Check environment
+    if not check_environment():
+        print("\n❌ Environment check failed. Please fix the issues above.")
+        sys.exit(1)
+
+    # Initialize assistant
+    try:
+        print("\n🔄 Initializing Smart Home Assistant...")
+        from smart_home.core.assistant import SmartHomeAssistant
+
+        assistant = SmartHomeAssistant()
+
+        # Main application loop
+        while True:
+            choice = show_menu()
+
+            if choice == "1":
+                run_cli(assistant)
+            elif choice == "2":
+                run_voice_interface(assistant)
+            elif choice == "3":
+                run_simple_text_chat(assistant)
+            elif choice == "4":
+                show_system_status(assistant)
+            elif choice == "5":
+                test_all_services(assistant)
+            elif choice == "6":
+                print("\n👋 Thanks for using Smart Home Assistant!")
+                assistant.shutdown()
+                break
+            else:
+                print("❌ Invalid option. Please choose 1-6.")
+
+    except KeyboardInterrupt:
+        print("\n\n👋 Goodbye!")
+    except Exception as e:
+        logger.error("Application error: %s", e)
+        print(f"\n❌ Failed to start Smart Home Assistant:")
+        print(f"Error: {e}")
+        print(f"\n💡 Common solutions:")
+        print(f"   • Check that GROQ_API_KEY is set in .env file")
+        print(f"   • Verify .env file exists (copy from .env.example)")
+        print(f"   • Get free API key from: https://console.groq.com")
+
+
+if __name__ == "__main__":
+    main()
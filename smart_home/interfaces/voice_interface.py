@@ -6,8 +6,11 @@ import time
 import logging
 import re
 import unicodedata
+import hashlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from importlib.util import find_spec
 from typing import Optional, Callable
-import whisper
 from gtts import gTTS
 import pygame
 import tempfile
@@ -17,6 +20,92 @@ from smart_home.config.app_config import my_config
 
 logger = logging.getLogger(__name__)
 
+# faster-whisper (CTranslate2, int8) is several times quicker on CPU; openai-whisper is the fallback
+FASTER_WHISPER = find_spec("faster_whisper") is not None
+# Intra-op threads for Whisper - roughly the physical cores, leaving the rest for audio and TTS
+STT_THREADS = max(1, (os.cpu_count() or 2) // 2)
+
+# A small keyword-spotting model (openWakeWord, ONNX) listens for the wake word when installed,
+# so Whisper only runs on the command itself
+OPENWAKEWORD = find_spec("openwakeword") is not None
+WAKE_WORD_MODEL = "hey_jarvis"
+WAKE_WORD_THRESHOLD = 0.5
+
+# Voiced speech has a moderate zero-crossing rate and a peaky spectrum; clicks, bangs and hiss don't
+SPEECH_ZCR_RANGE = (0.02, 0.3)
+SPEECH_MAX_FLATNESS = 0.4
+
+# Synthesized speech is kept on disk by (lang, text), least recently played evicted first
+TTS_CACHE_DIR = os.path.join(tempfile.gettempdir(), "smart_home_tts")
+TTS_CACHE_LIMIT = 10 * 1024 * 1024
+
+# Short fixed replies, decoded into memory once at startup
+PROMPT_PHRASES = ("Yes?", "Done.", "I didn't hear a command.", "I couldn't understand that. Please try again.")
+
+# Speech cleaning patterns, compiled once
+_EMOJI_RE = re.compile(
+    "["
+    "\U0001F600-\U0001F64F"  # emoticons
+    "\U0001F300-\U0001F5FF"  # symbols & pictographs
+    "\U0001F680-\U0001F6FF"  # transport & map symbols
+    "\U0001F1E0-\U0001F1FF"  # flags (iOS)
+    "\U0001F900-\U0001F9FF"  # supplemental symbols
+    "\U00002600-\U000026FF"  # miscellaneous symbols
+    "\U00002700-\U000027BF"  # dingbats
+    "\U0000FE00-\U0000FE0F"  # variation selectors
+    "\U0001F200-\U0001F2FF"  # enclosed characters
+    "\U00003030"  # wavy dash
+    "\U0001F004"  # mahjong tile
+    "\U0001F0CF"  # playing card
+    "]+",
+    flags=re.UNICODE
+)
+_EXTRA_SYMBOLS_RE = re.compile(r'[✅❌⭐⚡▶️⏹️⏸️⏯️⏭️⏮️⏬⏫🔄🔃🔂🔁🔀↩️↪️⤴️⤵️]')
+_DISALLOWED_SYMBOLS_RE = re.compile(r'[^\w\s.,!?:;()\-\'"°%&+=/]')
+_PUNCTUATION_SPACING_RE = re.compile(r'\s*([.,!?:;])\s*')
+_REPEATED_PUNCTUATION_RE = re.compile(r'[.,!?:;]{2,}')
+_WHITESPACE_RE = re.compile(r'\s+')
+_TIME_RE = re.compile(r'(\d{1,2}):(\d{2})\s*(AM|PM|am|pm)?')
+_TEMPERATURE_RE = re.compile(r'([\d.]+)°([CFcf])')
+_PERCENT_RE = re.compile(r'([\d.]+)\s*%')
+_DECIMAL_RE = re.compile(r'\b(\d+\.\d+)\b')
+_WHOLE_NUMBER_RE = re.compile(r'\b(\d{1,3})\b')
+_AM_RE = re.compile(r'\bAM\b', re.IGNORECASE)
+_PM_RE = re.compile(r'\bPM\b', re.IGNORECASE)
+_PERSIAN_DISALLOWED_RE = re.compile(
+    r'[^\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF'
+    r'\w\s.,!?()\'"-]+'
+)
+_FALLBACK_DISALLOWED_RE = re.compile(r'[^\w\s.,!?()-]')
+_SPECIAL_CHARACTERS = str.maketrans({
+    '&': ' and ',
+    '+': ' plus ',
+    '=': ' equals ',
+    '/': ' slash ',
+    '@': ' at '
+})
+
+
+def _quantize_linear_layers(model):
+    """Dynamically quantize a Whisper model's Linear layers to INT8 in place"""
+    import torch
+    from torch import nn
+
+    # Whisper builds its layers from a Linear subclass, and quantize_dynamic only matches
+    # exact types - swap in plain nn.Linear modules that share the same parameters
+    for module in list(model.modules()):
+        for name, child in list(module.named_children()):
+            if isinstance(child, nn.Linear) and type(child) is not nn.Linear:
+                plain = nn.Linear(child.in_features, child.out_features, bias=child.bias is not None, device="meta")
+                plain.weight = child.weight
+                plain.bias = child.bias
+                setattr(module, name, plain)
+
+    model = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8, inplace=True)
+    if not any(isinstance(module, torch.ao.nn.quantized.dynamic.Linear) for module in model.modules()):
+        raise RuntimeError("Whisper has no Linear layers left to quantize")
+    return model
+
 
 class VoiceInterface:
     """
@@ -36,6 +125,11 @@ class VoiceInterface:
         """Initialize enhanced voice interface"""
         self.assistant = assistant
         self.wake_words = ["hey assistant", "hey", "assistant"]
+        # Whole-word match of any wake word, longest first so the full phrase is reported
+        self._wake_re = re.compile(
+            r'\b(?:' + '|'.join(map(re.escape, sorted(self.wake_words, key=len, reverse=True))) + r')\b',
+            re.IGNORECASE
+        )
 
         # Audio settings
         self.sample_rate = 16000
@@ -46,19 +140,45 @@ class VoiceInterface:
         self.is_recording_command = False
         self.listening_paused = False
         self.is_speaking = False
+        # Set whenever nothing is being spoken, so waiters block instead of polling
+        self._speech_done = threading.Event()
+        self._speech_done.set()
+        # Microphone chunks to drop once speech ends, so the speaker's tail isn't heard as input
+        self._discard_chunks_remaining = 0
 
         # Audio processing
-        self.audio_queue = queue.Queue()
-        self.command_queue = queue.Queue()
-        self.audio_buffer = []
+        self.audio_queue = queue.SimpleQueue()
+        self.command_queue = queue.SimpleQueue()
+        # Chunk buffers handed back by the consumers, reused by the audio callback
+        self._buffer_pool = deque(maxlen=64)
+
+        # Last 4 seconds of audio in a ring buffer. It is stored twice back to back,
+        # so the newest samples are always one contiguous slice (no copy to read them)
+        self.buffer_samples = self.sample_rate * 4
+        self._ring = np.zeros(self.buffer_samples * 2, dtype=np.float32)
+        self._ring_pos = 0
+        self._ring_fill = 0
+
+        # Up to 10 seconds of command audio, written in place and reused for every command
+        self._command_buffer = np.empty(self.sample_rate * 10, dtype=np.float32)
 
         # Voice components
         self.whisper_model = None
+        self.wake_model = None
+        # Set when the wake model's audio stream had a gap; the processor thread resets it before the next chunk
+        self._wake_model_stale = False
+        # Whisper runs on its own thread so the audio processor loop never waits for it
+        self._stt_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+        self._wake_check: Optional[Future] = None
+        self._prompt_sounds = {}
         self.noise_level = 0.0
         self.vad_threshold = 0.003
 
+        os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+
         # Threading
         self.command_lock = threading.Lock()
+        self._processor_thread: Optional[threading.Thread] = None
 
         # Initialize enhanced text cleaning
         self._init_enhanced_cleaning()
@@ -92,6 +212,13 @@ class VoiceInterface:
             'WiFi': 'Wi-Fi', 'USB': 'U S B', 'HDMI': 'H D M I'
         }
 
+        # All normalizations in one case-insensitive pass (longest names first, so 'Room 1' beats 'Room')
+        self._device_lookup = {device.lower(): normalized for device, normalized in self.device_normalizations.items()}
+        names = sorted(self.device_normalizations, key=len, reverse=True)
+        self._device_pattern = re.compile(
+            r'\b(?:' + '|'.join(map(re.escape, names)) + r')\b', re.IGNORECASE
+        )
+
     def _initialize_voice_components(self):
         """Initialize voice recognition components"""
         try:
@@ -99,11 +226,31 @@ class VoiceInterface:
 
             # Initialize Whisper
             print("   📥 Loading Whisper model...")
-            self.whisper_model = whisper.load_model("base")
+            if FASTER_WHISPER:
+                from faster_whisper import WhisperModel
+
+                self.whisper_model = WhisperModel("base", device="cpu", compute_type="int8", cpu_threads=STT_THREADS)
+            else:
+                import torch
+                import whisper
+
+                torch.set_num_threads(STT_THREADS)
+                torch.set_num_interop_threads(1)
+                self.whisper_model = whisper.load_model("base")
+                if self.whisper_model.device.type == "cpu":
+                    # INT8 weights for the Linear layers - the bulk of Whisper's CPU time
+                    self.whisper_model = _quantize_linear_layers(self.whisper_model)
+
+            # Warm up on a second of silence so the first real command doesn't pay for lazy init
+            self._transcribe(np.zeros(self.sample_rate, dtype=np.float32))
             print("   ✅ Whisper model loaded")
 
+            if OPENWAKEWORD:
+                self._load_wake_model()
+
             # Initialize pygame for TTS
             pygame.mixer.init()
+            self._load_prompt_sounds()
             print("   ✅ TTS system ready")
 
             print("✅ Voice interface ready!")
@@ -112,14 +259,41 @@ class VoiceInterface:
             logger.error(f"Error initializing voice components: {e}")
             raise Exception(f"Failed to initialize voice components: {e}")
 
+    def _load_wake_model(self):
+        """Load the openWakeWord model, falling back to Whisper wake checks if it can't be loaded"""
+        try:
+            from openwakeword.model import Model
+            from openwakeword.utils import download_models
+
+            print("   📥 Loading wake word model...")
+            # Fetches the ONNX files on first use, no-op once they're on disk
+            download_models(model_names=[WAKE_WORD_MODEL])
+            self.wake_model = Model(wakeword_models=[WAKE_WORD_MODEL])
+            self.wake_words = [WAKE_WORD_MODEL.replace("_", " ")]
+            print("   ✅ Wake word model loaded")
+        except Exception as e:
+            self.wake_model = None
+            logger.warning(f"Could not load wake word model, using Whisper for wake words: {e}")
+            print("   ⚠️ Wake word model unavailable - listening with Whisper")
+
+    def _load_prompt_sounds(self):
+        """Decode the fixed prompts into in-memory Sounds (skipped ones fall back to _speak)"""
+        for phrase in PROMPT_PHRASES:
+            try:
+                self._prompt_sounds[phrase] = pygame.mixer.Sound(self._tts_audio_path(phrase, 'en'))
+            except Exception as e:
+                logger.warning(f"Could not preload prompt '{phrase}': {e}")
+
     def run(self):
-        """Start the enhanced voice interface"""
+        """Start the enhanced voice interface (can be called again after it stops)"""
         if not self.whisper_model:
             print("❌ Voice components not ready")
             return
 
         self._show_voice_welcome()
 
+        # Start each session clean - the Whisper model and mixer stay loaded
+        self._reset_session()
         self.is_listening = True
 
         try:
@@ -127,18 +301,20 @@ class VoiceInterface:
             self._start_audio_stream()
 
             # Start processing thread
-            processor_thread = threading.Thread(target=self._audio_processor_loop, daemon=True)
-            processor_thread.start()
+            self._processor_thread = threading.Thread(target=self._audio_processor_loop, daemon=True)
+            self._processor_thread.start()
 
             # Initial greeting
-            self._speak("Voice assistant ready. Say hey assistant to give commands.")
+            wake_word = self.wake_words[0]
+            self._speak(f"Voice assistant ready. Say {wake_word} to give commands.")
 
+            wake_word = wake_word.capitalize()
             print("✅ Voice interface active!")
             print("👂 Listening for wake words...")
-            print("💡 Say: 'Hey assistant' then give your command")
-            print("💡 Try: 'Hey assistant, what time is it?'")
-            print("💡 Or: 'Hey assistant, what's the weather?'")
-            print("💡 Persian: 'Hey assistant, چراغ آشپزخانه را روشن کن'")
+            print(f"💡 Say: '{wake_word}' then give your command")
+            print(f"💡 Try: '{wake_word}, what time is it?'")
+            print(f"💡 Or: '{wake_word}, what's the weather?'")
+            print(f"💡 Persian: '{wake_word}, چراغ آشپزخانه را روشن کن'")
             print("💡 Press Ctrl+C to stop")
             print("-" * 60)
 
@@ -148,10 +324,30 @@ class VoiceInterface:
 
         except KeyboardInterrupt:
             print("\n🔇 Stopping voice interface...")
-            self.stop_listening()
         except Exception as e:
             logger.error(f"Voice interface error: {e}")
             print(f"❌ Voice interface error: {e}")
+        finally:
+            self.stop_listening()
+
+    def _reset_session(self):
+        """Drop audio and flags left over from a previous run"""
+        self.is_recording_command = False
+        self.listening_paused = False
+        self.is_speaking = False
+        self._speech_done.set()
+        self._discard_chunks_remaining = 0
+        self._wake_model_stale = False
+        if self.wake_model is not None:
+            self.wake_model.reset()
+        self._ring_pos = 0
+        self._ring_fill = 0
+        for pending in (self.audio_queue, self.command_queue):
+            while True:
+                try:
+                    pending.get_nowait()
+                except queue.Empty:
+                    break
 
     def _show_voice_welcome(self):
         """Show enhanced voice interface welcome"""
@@ -160,7 +356,7 @@ class VoiceInterface:
         print("🎤" + "=" * 58 + "🎤")
         print("🌍 Multilingual Support: English + Persian")
         print("👂 Wake Words: " + ", ".join(f"'{w}'" for w in self.wake_words))
-        print("🗣️  Speech-to-Text: OpenAI Whisper")
+        print(f"🗣️  Speech-to-Text: {'faster-whisper (CTranslate2)' if FASTER_WHISPER else 'OpenAI Whisper'}")
         print("🔊 Text-to-Speech: Google TTS + Enhanced Cleaning")
         print("🧹 Features: Complete emoji removal, smart number conversion")
         print("🎤" + "=" * 58 + "🎤")
@@ -177,16 +373,25 @@ class VoiceInterface:
                 # Don't process audio when speaking (prevents feedback)
                 if self.is_speaking:
                     return
+                if self._discard_chunks_remaining > 0:
+                    self._discard_chunks_remaining -= 1
+                    return
 
                 # Always add to command queue if recording
                 if self.is_recording_command:
-                    self.command_queue.put(audio_data.copy())
+                    self.command_queue.put(self._copy_to_buffer(audio_data))
 
                 # Only process for wake words when not paused
                 if not self.listening_paused:
-                    max_vol = np.max(np.abs(audio_data))
+                    # The streaming wake model needs every chunk, quiet ones included
+                    if self.wake_model is not None:
+                        self.audio_queue.put(self._copy_to_buffer(audio_data))
+                        return
+
+                    # Peak level from max/min - no abs() temporary per callback
+                    max_vol = max(audio_data.max(), -audio_data.min())
                     if max_vol > 0.002:
-                        self.audio_queue.put(audio_data.copy())
+                        self.audio_queue.put(self._copy_to_buffer(audio_data))
 
             self.audio_stream = sd.InputStream(
                 callback=audio_callback,
@@ -209,28 +414,67 @@ class VoiceInterface:
             try:
                 # Get audio chunk with timeout
                 audio_chunk = self.audio_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
 
+            try:
                 # Skip processing if speaking
                 if self.is_speaking:
                     continue
 
-                # Add to buffer
-                self.audio_buffer.extend(audio_chunk)
+                if self.wake_model is not None:
+                    self._check_wake_model(audio_chunk)
+                    continue
 
-                # Keep last 4 seconds
-                max_samples = self.sample_rate * 4
-                if len(self.audio_buffer) > max_samples:
-                    self.audio_buffer = self.audio_buffer[-max_samples:]
+                # Add to buffer (oldest samples beyond 4 seconds are overwritten)
+                self._ring_append(audio_chunk)
 
-                # Check for voice activity
+                # Check for voice activity, and only wake Whisper for audio that sounds like speech
                 if self._detect_voice_activity(audio_chunk):
-                    if len(self.audio_buffer) >= self.sample_rate * 2:
+                    if self._ring_fill >= self.sample_rate * 2 and self._is_speech_like(audio_chunk):
                         self._check_for_wake_word()
 
-            except queue.Empty:
-                continue
             except Exception as e:
                 logger.error(f"Audio processing error: {e}")
+            finally:
+                self._buffer_pool.append(audio_chunk)
+
+    def _copy_to_buffer(self, audio_data: np.ndarray) -> np.ndarray:
+        """Copy a callback chunk into a pooled buffer (allocating only when the pool is empty)"""
+        try:
+            buffer = self._buffer_pool.pop()
+        except IndexError:
+            buffer = None
+        if buffer is None or buffer.shape != audio_data.shape:
+            return audio_data.copy()
+        np.copyto(buffer, audio_data)
+        return buffer
+
+    def _ring_append(self, chunk: np.ndarray):
+        """Write a chunk into both copies of the ring buffer"""
+        size = self.buffer_samples
+        if len(chunk) > size:
+            chunk = chunk[-size:]
+        n = len(chunk)
+        pos = self._ring_pos
+        ring = self._ring
+
+        first = min(n, size - pos)
+        ring[pos:pos + first] = chunk[:first]
+        ring[pos + size:pos + size + first] = chunk[:first]
+        rest = n - first
+        if rest:
+            ring[:rest] = chunk[first:]
+            ring[size:size + rest] = chunk[first:]
+
+        self._ring_pos = (pos + n) % size
+        self._ring_fill = min(self._ring_fill + n, size)
+
+    def _ring_tail(self, n: int) -> np.ndarray:
+        """Get a view of the newest n buffered samples"""
+        n = min(n, self._ring_fill)
+        end = self._ring_pos + self.buffer_samples
+        return self._ring[end - n:end]
 
     def _detect_voice_activity(self, audio_chunk: np.ndarray) -> bool:
         """Voice activity detection"""
@@ -239,8 +483,7 @@ class VoiceInterface:
             if self.is_speaking:
                 return False
 
-            # Calculate RMS volume
-            volume = np.sqrt(np.mean(audio_chunk ** 2))
+            volume = self._chunk_volume(audio_chunk)
 
             # Update noise level estimate
             if self.noise_level == 0.0:
@@ -248,12 +491,11 @@ class VoiceInterface:
             else:
                 self.noise_level = self.noise_level * 0.95 + volume * 0.05
 
-            threshold = max(0.005, self.noise_level * 2)
-            voice_detected = volume > threshold
+            voice_detected = volume > self._voice_threshold()
 
-            # DEBUGGING: Show more information
-            if voice_detected:
-                print(f"🎤 Voice detected! Vol: {volume:.4f}")
+            # DEBUGGING: Show more information (off the console - this runs for every chunk)
+            if voice_detected and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Voice detected - vol %.4f, noise %.4f", volume, self.noise_level)
 
             return voice_detected
 
@@ -261,6 +503,26 @@ class VoiceInterface:
             logger.error(f"VAD error: {e}")
             return False
 
+    def _chunk_volume(self, audio_chunk: np.ndarray) -> float:
+        """RMS volume of a chunk (dot product avoids squaring into a temporary)"""
+        return float(np.sqrt(np.dot(audio_chunk, audio_chunk) / audio_chunk.size))
+
+    def _voice_threshold(self) -> float:
+        """Volume above which a chunk counts as voice, relative to the background noise"""
+        return max(0.005, self.noise_level * 2)
+
+    def _is_speech_like(self, audio: np.ndarray) -> bool:
+        """Cheap speech check from zero-crossing rate and spectral flatness"""
+        signs = np.signbit(audio)
+        zcr = np.count_nonzero(signs[1:] != signs[:-1]) / max(1, audio.size - 1)
+        if not SPEECH_ZCR_RANGE[0] < zcr < SPEECH_ZCR_RANGE[1]:
+            return False
+
+        # Geometric over arithmetic mean of the magnitude spectrum: ~1 for noise, near 0 for tones/voice
+        spectrum = np.abs(np.fft.rfft(audio))
+        flatness = np.exp(np.mean(np.log(spectrum + 1e-9))) / (np.mean(spectrum) + 1e-9)
+        return flatness < SPEECH_MAX_FLATNESS
+
     def _check_for_wake_word(self):
         """Check recent audio for wake words"""
         try:
@@ -268,20 +530,35 @@ class VoiceInterface:
             if self.is_recording_command or self.is_speaking:
                 return
 
-            # Get recent audio (last 3 seconds)
-            recent_samples = min(self.sample_rate * 3, len(self.audio_buffer))
+            # One wake check at a time - chunks arriving meanwhile are covered by the next one
+            if self._wake_check is not None and not self._wake_check.done():
+                return
+
+            # Get recent audio (last 1.5 seconds - plenty for a two-word wake phrase)
+            recent_samples = min(self.sample_rate * 3 // 2, self._ring_fill)
             if recent_samples < self.sample_rate:
                 return
 
-            recent_audio = np.array(self.audio_buffer[-recent_samples:], dtype=np.float32)
+            # Copied, because the ring keeps filling while Whisper works
+            recent_audio = self._ring_tail(recent_samples).copy()
 
             # DEBUGGING: Check audio level
-            audio_level = np.max(np.abs(recent_audio))
-            print(f"\n🔍 Checking for wake word... Audio level: {audio_level:.4f}, Buffer size: {recent_samples}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Checking for wake word - peak %.4f, %d samples",
+                             max(recent_audio.max(), -recent_audio.min()), recent_samples)
 
-            # Recognize speech
-            result = self.whisper_model.transcribe(recent_audio, language='en', fp16=False, temperature=0.0)
-            text = result["text"].strip().lower()
+            # Recognize speech on the Whisper thread
+            self._wake_check = self._stt_executor.submit(self._transcribe_window, recent_audio)
+            self._wake_check.add_done_callback(self._on_wake_transcript)
+
+        except Exception as e:
+            logger.error(f"Wake word detection error: {e}")
+            print(f"❌ Wake word detection error: {e}")
+
+    def _on_wake_transcript(self, future: Future):
+        """Look for a wake word in a finished wake check transcript"""
+        try:
+            text = future.result()
 
             if not text:
                 print("❌ No text recognized from audio")
@@ -289,27 +566,45 @@ class VoiceInterface:
 
             print(f"👂 Heard: '{text}'")
 
-            # wake word detection
-            text_words = text.split()
-            for wake_word in self.wake_words:
-                wake_parts = wake_word.lower().split()
-
-                # Check if all parts of wake word are in the text
-                if all(part in text for part in wake_parts):
-                    print(f"🎯 Wake word detected: '{wake_word}' in '{text}'")
-                    self._handle_wake_word()
-                    return
+            # The interface may have stopped, or recording started, while Whisper was busy
+            if not self.is_listening or self.is_recording_command or self.is_speaking:
+                return
 
-            print(f"❌ No wake word found in: '{text}'")
+            # wake word detection
+            match = self._wake_re.search(text)
+            if match:
+                print(f"🎯 Wake word detected: '{match.group(0)}' in '{text}'")
+                # Off the Whisper thread - the acknowledgement may wait on gTTS and playback
+                threading.Thread(target=self._handle_wake_word, daemon=True).start()
 
         except Exception as e:
             logger.error(f"Wake word detection error: {e}")
             print(f"❌ Wake word detection error: {e}")
 
+    def _check_wake_model(self, audio_chunk: np.ndarray):
+        """Score one chunk with the keyword-spotting model and trigger on the wake word"""
+        if self.is_recording_command:
+            self._wake_model_stale = True
+            return
+
+        # Audio was skipped (speaking, paused, recording) - don't splice across the gap
+        if self._wake_model_stale:
+            self._wake_model_stale = False
+            self.wake_model.reset()
+
+        # openWakeWord expects 16 kHz int16 PCM and buffers partial frames itself
+        scores = self.wake_model.predict((audio_chunk * 32767).astype(np.int16))
+        score = max(scores.values(), default=0.0)
+        if score > WAKE_WORD_THRESHOLD:
+            print(f"🎯 Wake word detected! Score: {score:.2f}")
+            # Forget the frames that just fired so the same utterance doesn't trigger again
+            self.wake_model.reset()
+            self._handle_wake_word()
+
     def _handle_wake_word(self):
         """Handle wake word detection"""
         with self.command_lock:
-            if self.is_recording_command or self.is_speaking:
+            if not self.is_listening or self.is_recording_command or self.is_speaking:
                 return
 
             print("🎯 Wake word detected! Preparing to record...")
@@ -324,7 +619,7 @@ class VoiceInterface:
 
         # Acknowledge and start recording
         self._pause_listening()
-        self._speak("Yes?")
+        self._speak_prompt("Yes?")
 
         # Wait for TTS to finish before resuming
         self._wait_for_speech_complete()
@@ -338,9 +633,12 @@ class VoiceInterface:
         print("🎙️ Recording command... (speak now)")
 
         try:
-            command_audio = []
+            command_buffer = self._command_buffer
+            max_samples = len(command_buffer)
+            recorded = 0
             start_time = time.time()
             last_voice_time = start_time
+            voice_heard = False
 
             # Give user time to start speaking
             time.sleep(0.5)
@@ -348,12 +646,22 @@ class VoiceInterface:
             while self.is_recording_command:
                 try:
                     audio_chunk = self.command_queue.get(timeout=0.3)
-                    command_audio.append(audio_chunk)
+                    n = min(len(audio_chunk), max_samples - recorded)
+                    command_buffer[recorded:recorded + n] = audio_chunk[:n]
+                    recorded += n
 
-                    # Check for voice activity
-                    if self._detect_voice_activity(audio_chunk):
+                    # Check for voice activity - volume only, so the command itself doesn't
+                    # leak into the background noise estimate
+                    if self._chunk_volume(audio_chunk) > self._voice_threshold():
                         last_voice_time = time.time()
-                        print("🎤 Recording...", end="\r", flush=True)
+                        if not voice_heard:
+                            voice_heard = True
+                            print("🎤 Recording...")
+                    self._buffer_pool.append(audio_chunk)
+
+                    if recorded == max_samples:
+                        print("⏹️ Command recording finished")
+                        break
 
                     # Check timeouts
                     elapsed = time.time() - start_time
@@ -361,23 +669,22 @@ class VoiceInterface:
 
                     # Stop recording if too much time or silence
                     if elapsed > 10 or (elapsed > 1 and silence_duration > 2.5):
-                        print("\n⏹️ Command recording finished")
+                        print("⏹️ Command recording finished")
                         break
 
                 except queue.Empty:
                     elapsed = time.time() - start_time
                     if elapsed > 8:
-                        print("\n⏹️ Command recording timeout")
+                        print("⏹️ Command recording timeout")
                         break
 
             # Process the recorded command
-            if command_audio and len(command_audio) > 3:
-                combined_audio = np.concatenate(command_audio)
+            if recorded > 3 * self.chunk_size:
                 print("🔄 Processing command...")
-                self._process_voice_command(combined_audio)
+                self._process_voice_command(command_buffer[:recorded])
             else:
                 print("⚠️ No command recorded")
-                self._speak("I didn't hear a command.")
+                self._speak_prompt("I didn't hear a command.")
 
         except Exception as e:
             logger.error(f"Command recording error: {e}")
@@ -389,17 +696,37 @@ class VoiceInterface:
                 self._wait_for_speech_complete()
                 print("✅ Ready for next wake word...")
 
+    def _transcribe(self, audio: np.ndarray) -> str:
+        """Transcribe English speech from a float32 array with whichever Whisper backend is loaded"""
+        if FASTER_WHISPER:
+            # Greedy decoding - our clips are short and we run our own VAD
+            segments, _ = self.whisper_model.transcribe(
+                audio, language='en', beam_size=1, vad_filter=False, temperature=0.0
+            )
+            return " ".join(segment.text for segment in segments).strip()
+
+        result = self.whisper_model.transcribe(audio, language='en', fp16=False, temperature=0.0)
+        return result["text"].strip()
+
+    def _transcribe_window(self, audio: np.ndarray) -> str:
+        """Transcribe a clip shorter than Whisper's 30 s window with a single decode pass"""
+        if FASTER_WHISPER:
+            return self._transcribe(audio)
+
+        import whisper
+
+        # transcribe() would add its seek loop, temperature fallbacks and timestamp handling
+        mel = whisper.log_mel_spectrogram(
+            whisper.pad_or_trim(audio), self.whisper_model.dims.n_mels
+        ).to(self.whisper_model.device)
+        options = whisper.DecodingOptions(language='en', fp16=False, temperature=0.0, without_timestamps=True)
+        return whisper.decode(self.whisper_model, mel, options).text.strip()
+
     def _process_voice_command(self, audio_data: np.ndarray):
         """Process recorded voice command"""
         try:
             # Recognize speech
-            result = self.whisper_model.transcribe(
-                audio_data,
-                language='en',
-                fp16=False,
-                temperature=0.0
-            )
-            command = result["text"].strip()
+            command = self._stt_executor.submit(self._transcribe, audio_data).result()
 
             if command:
                 print(f"📝 Command: '{command}'")
@@ -417,14 +744,14 @@ class VoiceInterface:
                         print(f"🧹 Cleaned for Speech: {clean_response}")
                         self._speak(clean_response, is_persian)
                     else:
-                        self._speak("Done.")
+                        self._speak_prompt("Done.")
 
                 except Exception as e:
                     logger.error(f"Command execution error: {e}")
                     self._speak("Sorry, I had trouble with that command.")
             else:
                 print("⚠️ Could not understand command")
-                self._speak("I couldn't understand that. Please try again.")
+                self._speak_prompt("I couldn't understand that. Please try again.")
 
         except Exception as e:
             logger.error(f"Command processing error: {e}")
@@ -493,44 +820,26 @@ class VoiceInterface:
     def _remove_all_emojis_and_symbols(self, text: str) -> str:
         """Remove ALL emojis and unwanted symbols using comprehensive Unicode ranges"""
         # Comprehensive emoji removal using Unicode blocks
-        emoji_pattern = re.compile(
-            "["
-            "\U0001F600-\U0001F64F"  # emoticons
-            "\U0001F300-\U0001F5FF"  # symbols & pictographs
-            "\U0001F680-\U0001F6FF"  # transport & map symbols
-            "\U0001F1E0-\U0001F1FF"  # flags (iOS)
-            "\U0001F900-\U0001F9FF"  # supplemental symbols
-            "\U00002600-\U000026FF"  # miscellaneous symbols
-            "\U00002700-\U000027BF"  # dingbats
-            "\U0000FE00-\U0000FE0F"  # variation selectors
-            "\U0001F200-\U0001F2FF"  # enclosed characters
-            "\U00003030"  # wavy dash
-            "\U0001F004"  # mahjong tile
-            "\U0001F0CF"  # playing card
-            "]+",
-            flags=re.UNICODE
-        )
-
-        text = emoji_pattern.sub(' ', text)
+        text = _EMOJI_RE.sub(' ', text)
 
         # Remove additional problematic symbols
-        text = re.sub(r'[✅❌⭐⚡▶️⏹️⏸️⏯️⏭️⏮️⏬⏫🔄🔃🔂🔁🔀↩️↪️⤴️⤵️]', ' ', text)
+        text = _EXTRA_SYMBOLS_RE.sub(' ', text)
 
         # Keep only letters, numbers, basic punctuation, and essential symbols
-        text = re.sub(r'[^\w\s.,!?:;()\-\'"°%&+=/]', ' ', text)
+        text = _DISALLOWED_SYMBOLS_RE.sub(' ', text)
 
         return text
 
     def _normalize_spacing_and_punctuation(self, text: str) -> str:
         """Normalize spacing and punctuation"""
         # Fix spacing around punctuation
-        text = re.sub(r'\s*([.,!?:;])\s*', r'\1 ', text)
+        text = _PUNCTUATION_SPACING_RE.sub(r'\1 ', text)
 
         # Remove multiple consecutive punctuation
-        text = re.sub(r'[.,!?:;]{2,}', '.', text)
+        text = _REPEATED_PUNCTUATION_RE.sub('.', text)
 
         # Normalize multiple spaces
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
 
         return text.strip()
 
@@ -556,7 +865,7 @@ class VoiceInterface:
             return f"{hour_word}{minute_part}{period_part}"
 
         # Match time patterns
-        text = re.sub(r'(\d{1,2}):(\d{2})\s*(AM|PM|am|pm)?', time_replacer, text)
+        text = _TIME_RE.sub(time_replacer, text)
         return text
 
     def _convert_measurements(self, text: str) -> str:
@@ -578,7 +887,7 @@ class VoiceInterface:
             return f"{value_words} {unit_name}"
 
         # Temperature patterns
-        text = re.sub(r'([\d.]+)°([CFcf])', temp_replacer, text)
+        text = _TEMPERATURE_RE.sub(temp_replacer, text)
 
         return text
 
@@ -590,7 +899,7 @@ class VoiceInterface:
             number_words = self._convert_number_string(number)
             return f"{number_words} percent"
 
-        text = re.sub(r'([\d.]+)\s*%', percent_replacer, text)
+        text = _PERCENT_RE.sub(percent_replacer, text)
         return text
 
     def _convert_decimal_numbers(self, text: str) -> str:
@@ -599,7 +908,7 @@ class VoiceInterface:
         def decimal_replacer(match):
             return self._convert_number_string(match.group(1))
 
-        text = re.sub(r'\b(\d+\.\d+)\b', decimal_replacer, text)
+        text = _DECIMAL_RE.sub(decimal_replacer, text)
         return text
 
     def _convert_whole_numbers(self, text: str) -> str:
@@ -612,41 +921,29 @@ class VoiceInterface:
                 return self._number_to_words(number)
             return str(number)
 
-        text = re.sub(r'\b(\d{1,3})\b', number_replacer, text)
+        text = _WHOLE_NUMBER_RE.sub(number_replacer, text)
         return text
 
     def _expand_abbreviations_and_devices(self, text: str) -> str:
         """Expand abbreviations and device names"""
         # Time abbreviations
-        text = re.sub(r'\bAM\b', 'A M', text, flags=re.IGNORECASE)
-        text = re.sub(r'\bPM\b', 'P M', text, flags=re.IGNORECASE)
+        text = _AM_RE.sub('A M', text)
+        text = _PM_RE.sub('P M', text)
 
         # Device normalizations
-        for device, normalized in self.device_normalizations.items():
-            pattern = rf'\b{re.escape(device)}\b'
-            text = re.sub(pattern, normalized, text, flags=re.IGNORECASE)
+        lookup = self._device_lookup
+        text = self._device_pattern.sub(lambda match: lookup[match.group(0).lower()], text)
 
         return text
 
     def _handle_special_characters(self, text: str) -> str:
         """Handle remaining special characters"""
-        replacements = {
-            '&': ' and ',
-            '+': ' plus ',
-            '=': ' equals ',
-            '/': ' slash ',
-            '@': ' at '
-        }
-
-        for symbol, word in replacements.items():
-            text = text.replace(symbol, word)
-
-        return text
+        return text.translate(_SPECIAL_CHARACTERS)
 
     def _final_cleanup(self, text: str) -> str:
         """Final cleanup and validation"""
         # Remove extra spaces
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         text = text.strip()
 
         # Ensure proper sentence ending
@@ -715,19 +1012,15 @@ class VoiceInterface:
         text = text.translate(self.persian_to_english)
 
         # Remove emojis but preserve Persian characters
-        persian_pattern = re.compile(
-            r'[^\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF'
-            r'\w\s.,!?()\'"-]+'
-        )
-        text = persian_pattern.sub(' ', text)
+        text = _PERSIAN_DISALLOWED_RE.sub(' ', text)
 
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _WHITESPACE_RE.sub(' ', text).strip()
         return text
 
     def _basic_fallback_cleaning(self, text: str) -> str:
         """Basic fallback if main cleaning fails"""
-        text = re.sub(r'[^\w\s.,!?()-]', ' ', text)
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _FALLBACK_DISALLOWED_RE.sub(' ', text)
+        text = _WHITESPACE_RE.sub(' ', text).strip()
 
         if text and not text.endswith(('.', '!', '?')):
             text += '.'
@@ -741,6 +1034,7 @@ class VoiceInterface:
 
         try:
             # Set speaking flag to prevent audio feedback
+            self._speech_done.clear()
             self.is_speaking = True
             print(f"🗣️ Speaking: '{text}'")
 
@@ -749,57 +1043,96 @@ class VoiceInterface:
                 is_persian = self.assistant.persian_service.is_persian(text)
 
             lang = 'fa' if is_persian else 'en'
+            audio_path = self._tts_audio_path(text, lang)
+
+            # Stop any previous audio before playing new
+            pygame.mixer.music.stop()
 
-            # Create TTS
-            tts = gTTS(text=text, lang=lang, slow=False)
+            # Play audio
+            pygame.mixer.music.load(audio_path)
+            pygame.mixer.music.play()
 
-            # Temporary file handling
-            temp_path = None
-            try:
-                # Create temporary file
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_file:
-                    temp_path = temp_file.name
-                    tts.save(temp_path)
+            # Wait for completion
+            while pygame.mixer.music.get_busy():
+                pygame.time.Clock().tick(10)
 
-                # Stop any previous audio before playing new
-                pygame.mixer.music.stop()
-                time.sleep(0.1)  # Brief pause
+        except Exception as e:
+            logger.error(f"TTS error: {e}")
+            print(f"❌ Could not speak response: {e}")
+        finally:
+            self._finish_speaking()
 
-                # Play audio
-                pygame.mixer.music.load(temp_path)
-                pygame.mixer.music.play()
+    def _finish_speaking(self):
+        """Mark playback as over, discarding the next few microphone chunks as echo"""
+        self._discard_chunks_remaining = 3
+        self._wake_model_stale = True
+        self.is_speaking = False
+        self._speech_done.set()
 
-                # Wait for completion
-                while pygame.mixer.music.get_busy():
-                    pygame.time.Clock().tick(10)
+    def _speak_prompt(self, phrase: str):
+        """Play a preloaded prompt without decoding an MP3"""
+        sound = self._prompt_sounds.get(phrase)
+        if sound is None:
+            self._speak(phrase)
+            return
 
-            finally:
-                # Cleanup with retry logic
-                if temp_path and os.path.exists(temp_path):
-                    try:
-                        # Ensure audio is stopped
-                        pygame.mixer.music.stop()
-                        time.sleep(0.1)
-                        os.unlink(temp_path)
-                    except PermissionError:
-                        # File may still be in use, try again after a delay
-                        time.sleep(0.5)
-                        try:
-                            os.unlink(temp_path)
-                        except:
-                            logger.warning(f"Could not delete temporary file: {temp_path}")
+        try:
+            self._speech_done.clear()
+            self.is_speaking = True
+            print(f"🗣️ Speaking: '{phrase}'")
+
+            pygame.mixer.music.stop()
+            sound.play()
+
+            # The clip length is known up front - sleep it out instead of polling the channel
+            time.sleep(sound.get_length())
 
         except Exception as e:
             logger.error(f"TTS error: {e}")
             print(f"❌ Could not speak response: {e}")
         finally:
-            time.sleep(0.5)
-            self.is_speaking = False
+            self._finish_speaking()
+
+    def _tts_audio_path(self, text: str, lang: str) -> str:
+        """Get the cached MP3 for this text, synthesizing it with gTTS on a miss"""
+        key = hashlib.sha1(f"{lang}:{text}".encode("utf-8")).hexdigest()
+        path = os.path.join(TTS_CACHE_DIR, f"{key}.mp3")
+
+        if os.path.exists(path):
+            # Mark as recently used for eviction
+            os.utime(path)
+            return path
+
+        # Write under a temporary name so a failed download never leaves a broken cache entry
+        partial_path = f"{path}.part"
+        gTTS(text=text, lang=lang, slow=False).save(partial_path)
+        os.replace(partial_path, path)
+        self._trim_tts_cache(keep=path)
+        return path
+
+    def _trim_tts_cache(self, keep: str):
+        """Delete the least recently used clips while the cache is over its size limit"""
+        entries = [entry for entry in os.scandir(TTS_CACHE_DIR) if entry.name.endswith(".mp3")]
+        total = sum(entry.stat().st_size for entry in entries)
+        if total <= TTS_CACHE_LIMIT:
+            return
+
+        for entry in sorted(entries, key=lambda e: e.stat().st_mtime):
+            if entry.path == keep:
+                continue
+            try:
+                size = entry.stat().st_size
+                os.unlink(entry.path)
+                total -= size
+            except OSError:
+                # Still open by the mixer - leave it for the next trim
+                continue
+            if total <= TTS_CACHE_LIMIT:
+                break
 
     def _wait_for_speech_complete(self):
         """Wait for any ongoing speech to complete"""
-        while self.is_speaking or pygame.mixer.music.get_busy():
-            time.sleep(0.1)
+        self._speech_done.wait()
 
     def _pause_listening(self):
         """Temporarily pause voice detection"""
@@ -809,6 +1142,7 @@ class VoiceInterface:
     def _resume_listening(self):
         """Resume voice detection"""
         self.listening_paused = False
+        self._wake_model_stale = True
         print("🔊 Resuming voice detection...")
 
     def stop_listening(self):
@@ -816,6 +1150,7 @@ class VoiceInterface:
         self.is_listening = False
         self.is_recording_command = False
         self.is_speaking = False
+        self._speech_done.set()
 
         # Stop audio stream
         if hasattr(self, 'audio_stream'):
@@ -824,10 +1159,17 @@ class VoiceInterface:
                 self.audio_stream.close()
             except:
                 pass
+            del self.audio_stream
+
+        # Let the processor thread see is_listening=False before a new run starts another
+        if self._processor_thread is not None:
+            self._processor_thread.join(timeout=2.0)
+            self._processor_thread = None
 
         # Stop any playing audio
         try:
             pygame.mixer.music.stop()
+            pygame.mixer.stop()
         except:
             pass
 
@@ -841,7 +1183,7 @@ class VoiceInterface:
             'paused': self.listening_paused,
             'speaking': self.is_speaking,
             'wake_words': self.wake_words,
-            'buffer_size': len(self.audio_buffer),
+            'buffer_size': self._ring_fill,
             'noise_level': self.noise_level,
             'enhanced_cleaning': True,
             'whisper_loaded': self.whisper_model is not None
@@ -1,11 +1,16 @@
+import hashlib
 import json
 import logging
-from typing import Dict, List, Any
+import threading
+from typing import Dict, Iterator, List, Any
 from groq import Groq
 from smart_home.config.app_config import my_config
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MODEL = "llama-3.3-70b-versatile"
+FAST_MODEL = "llama-3.1-8b-instant"  # good enough for simple device commands
+
 
 class LLMService:
     """LLM service for processing natural language commands"""
@@ -16,93 +21,150 @@ class LLMService:
             raise ValueError("Groq API key not configured")
 
         self.client = Groq(api_key=my_config.groq_api_key)
-        self.model = "llama-3.3-70b-versatile"
+        self.model = DEFAULT_MODEL
+        self.fast_model = FAST_MODEL
         self.conversation_history = []
+        # API requests run on several threads - appends and trims must not interleave
+        self._history_lock = threading.Lock()
+
+        # Built once and sent byte-for-byte identical on every request, so the
+        # provider's prompt cache can reuse the shared prefix
+        self.system_prompt = self._create_system_prompt()
+        self.functions = self._get_function_definitions()
+        prefix = json.dumps([self.system_prompt, self.functions], sort_keys=True, ensure_ascii=False)
+        self.prefix_hash = hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:12]
 
-        logger.info("LLM service initialized")
+        logger.info(f"LLM service initialized (prompt prefix {self.prefix_hash})")
 
-    def process_command(self, command: str, device_manager, weather_service=None, news_service=None) -> str:
+    def process_command(self, command: str, device_manager, weather_service=None, news_service=None,
+                        fast: bool = False) -> str:
         """Process user command using LLM with function calling"""
-        try:
-            logger.info(f"🧠 LLM processing command: '{command}'")
+        return "".join(self.process_command_stream(command, device_manager, weather_service, news_service, fast))
 
-            # Get available functions
-            functions = self._get_function_definitions()
+    def process_command_stream(self, command: str, device_manager, weather_service=None,
+                               news_service=None, fast: bool = False) -> Iterator[str]:
+        """Process user command, yielding the response as the LLM generates it (fast: use the small model)"""
+        model = self.fast_model if fast else self.model
+        try:
+            logger.info(f"🧠 LLM processing command with {model}: '{command}'")
 
-            # Create system prompt
-            system_prompt = self._create_system_prompt()
-            messages = [{"role": "system", "content": system_prompt}]
+            # Static system prompt first so every request shares the same prefix
+            messages = [{"role": "system", "content": self.system_prompt}]
 
             # Add last 6 messages (3 exchanges) for context
-            for entry in self.conversation_history[-6:]:
+            with self._history_lock:
+                recent_history = self.conversation_history[-6:]
+            for entry in recent_history:
                 messages.append({"role": "user", "content": entry["user"]})
                 messages.append({"role": "assistant", "content": entry["assistant"]})
 
             # Add current user message
             messages.append({"role": "user", "content": command})
 
-            logger.info(f"🔧 Calling Groq API with {len(messages)} messages")
+            logger.info(f"🔧 Calling Groq API with {len(messages)} messages (prompt prefix {self.prefix_hash})")
 
-            # Send to LLM
-            response = self.client.chat.completions.create(
-                model=self.model,
+            # Send to LLM - streamed, so direct answers reach the caller as they're generated
+            stream = self.client.chat.completions.create(
+                model=model,
                 messages=messages,
-                functions=functions,
+                functions=self.functions,
                 function_call="auto",
                 temperature=0.1,
                 max_tokens=2000,
-                timeout=30
+                timeout=30,
+                stream=True
             )
 
-            message = response.choices[0].message
-            logger.info(f"📨 LLM response received, has function call: {bool(message.function_call)}")
+            content_parts = []
+            call_name = ""
+            call_arguments = []
+            passing_through = False  # content is being yielded as it arrives
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+
+                # Function call name and arguments arrive in pieces, run it once the stream ends
+                calls = [delta.function_call] if getattr(delta, "function_call", None) else []
+                calls.extend(tool_call.function for tool_call in getattr(delta, "tool_calls", None) or ())
+                for call in calls:
+                    call_name += call.name or ""
+                    if call.arguments:
+                        call_arguments.append(call.arguments)
+
+                piece = delta.content
+                if not piece:
+                    continue
+                content_parts.append(piece)
+                if passing_through:
+                    yield piece
+                elif not self._may_be_text_function_call("".join(content_parts)):
+                    # Clearly not a text-format function call - release what was held back
+                    passing_through = True
+                    yield "".join(content_parts)
+
+            content = "".join(content_parts)
+            logger.info(f"📨 LLM response received, has function call: {bool(call_name)}")
 
             # Check if response contains function call text (Groq bug workaround)
-            if message.content and '<function=' in message.content:
+            if not passing_through and '<function=' in content:
                 logger.info("🔧 Detected function call in text format, parsing...")
                 final_response = self._parse_and_execute_function_from_text(
-                    message.content, device_manager, weather_service, news_service
+                    content, device_manager, weather_service, news_service
                 )
                 logger.info(f"🎯 Parsed function response: '{final_response}'")
-            elif message.function_call:
+            elif call_name:
                 # Execute function (normal case)
-                function_name = message.function_call.name
-                function_args = json.loads(message.function_call.arguments)
+                function_call = {"name": call_name, "arguments": "".join(call_arguments)}
+                function_args = json.loads(function_call["arguments"] or "{}")
 
-                logger.info(f"🔧 Executing function: {function_name} with args: {function_args}")
+                logger.info(f"🔧 Executing function: {call_name} with args: {function_args}")
 
                 # Execute the function
                 function_result = self._execute_function(
-                    function_name, function_args, device_manager, weather_service, news_service
+                    call_name, function_args, device_manager, weather_service, news_service
                 )
 
                 logger.info(f"⚙️ Function result: {function_result}")
 
-                # Generate natural response with conversation history
+                # Stream the natural response with conversation history
                 follow_up = self.client.chat.completions.create(
-                    model=self.model,
+                    model=model,
                     messages=messages + [
-                        {"role": "assistant", "content": "", "function_call": message.function_call},
-                        {"role": "function", "name": function_name, "content": function_result}
+                        {"role": "assistant", "content": "", "function_call": function_call},
+                        {"role": "function", "name": call_name, "content": function_result}
                     ],
                     temperature=0.3,
                     max_tokens=2000,
-                    timeout=30
+                    timeout=30,
+                    stream=True
                 )
 
-                final_response = follow_up.choices[0].message.content
+                parts = []
+                for chunk in follow_up:
+                    if not chunk.choices:
+                        continue
+                    piece = chunk.choices[0].delta.content
+                    if piece:
+                        parts.append(piece)
+                        yield piece
+
+                final_response = "".join(parts)
                 logger.info(f"🎯 Final LLM response: '{final_response}' (length: {len(final_response)})")
+
+                # Already sent to the caller, only fill in if nothing came through
+                if final_response.strip():
+                    self.save_to_history(command, final_response)
+                    return
+            elif passing_through:
+                # Direct response, already sent to the caller as it streamed
+                logger.info(f"💬 Direct LLM response: '{content}' (length: {len(content)})")
+                self.save_to_history(command, content)
+                return
             else:
-                final_response = message.content
+                final_response = content
                 logger.info(f"💬 Direct LLM response: '{final_response}' (length: {len(final_response)})")
 
-                # Additional check for function calls in content
-                if final_response and '<function=' in final_response:
-                    logger.info("🔧 Found function call in direct response, parsing...")
-                    final_response = self._parse_and_execute_function_from_text(
-                        final_response, device_manager, weather_service, news_service
-                    )
-
             # Validate response
             if not final_response:
                 logger.warning("⚠️ LLM returned empty response")
@@ -111,24 +173,34 @@ class LLMService:
                 logger.warning("⚠️ LLM returned whitespace-only response")
                 final_response = "I received your command but my response was empty. Please try again."
 
-            # Save conversation to history
-            self.conversation_history.append({
-                "user": command,
-                "assistant": final_response
-            })
-
-            # Keep only last 20 conversations
-            if len(self.conversation_history) > 20:
-                self.conversation_history = self.conversation_history[-20:]
+            self.save_to_history(command, final_response)
 
             logger.info(f"✅ Returning response of length {len(final_response)}")
-            return final_response
+            yield final_response
 
         except Exception as e:
             logger.error(f"❌ Error processing command: {e}")
             import traceback
             traceback.print_exc()
-            return f"❌ Error processing command: {str(e)}"
+            yield f"❌ Error processing command: {str(e)}"
+
+    @staticmethod
+    def _may_be_text_function_call(text: str) -> bool:
+        """Check whether streamed content so far could still be a '<function=' call written as text"""
+        text = text.lstrip()
+        return text.startswith("<function=") or "<function=".startswith(text)
+
+    def save_to_history(self, command: str, response: str):
+        """Save an exchange to the conversation history"""
+        with self._history_lock:
+            self.conversation_history.append({
+                "user": command,
+                "assistant": response
+            })
+
+            # Keep only last 20 conversations
+            if len(self.conversation_history) > 20:
+                self.conversation_history = self.conversation_history[-20:]
 
     def _parse_and_execute_function_from_text(self, text_response: str, device_manager, weather_service,
                                               news_service) -> str:
@@ -237,7 +309,8 @@ Always use the appropriate function for the user's request."""
 
     def _get_function_definitions(self) -> List[Dict]:
         """Get function definitions for LLM"""
-        all_locations = list(set(my_config.lamps + my_config.acs + my_config.tvs + ["all"]))
+        # Sorted so the schema (and the prompt prefix) is the same in every process
+        all_locations = sorted(set(my_config.lamps + my_config.acs + my_config.tvs + ["all"]))
 
         return [
             {
@@ -9,8 +9,9 @@ logger = logging.getLogger(__name__)
 class NewsService:
     """News headlines service"""
 
-    def __init__(self):
-        """Initialize news service"""
+    def __init__(self, session: Optional[requests.Session] = None):
+        """Initialize news service (pass a shared session to reuse pooled connections)"""
+        self.session = session or requests.Session()
         self.api_key = my_config.news_api_key
         self.api_url = "https://newsapi.org/v2/top-headlines"
 
@@ -33,7 +34,7 @@ class NewsService:
                 "pageSize": 5
             }
 
-            response = requests.get(self.api_url, params=params, timeout=30)
+            response = self.session.get(self.api_url, params=params, timeout=30)
 
             if response.status_code == 200:
                 data = response.json()
@@ -1,10 +1,37 @@
 import re
 import logging
-from typing import Tuple
+from typing import Optional, Tuple
 from smart_home.services.llm_service import LLMService
 
 logger = logging.getLogger(__name__)
 
+# Same ranges as PersianService.persian_ranges, as one precompiled character class
+_PERSIAN_CHAR_RE = re.compile('[\u0600-\u06FF\uFB50-\uFDFF\uFE70-\uFEFF]')
+
+# Canned device responses translated locally instead of with a second LLM call
+_PERSIAN_LOCATIONS = {
+    "kitchen": "آشپزخانه", "bathroom": "حمام", "room 1": "اتاق یک",
+    "room 2": "اتاق دو", "living room": "پذیرایی", "bedroom": "اتاق خواب",
+}
+_PERSIAN_DEVICE_TYPES = {"Lamp": "چراغ", "AC": "کولر", "TV": "تلویزیون"}
+_PERSIAN_DIGITS = str.maketrans("0123456789", "۰۱۲۳۴۵۶۷۸۹")
+
+_PERSIAN_TEMPLATES = [
+    (re.compile(r"(?P<emoji>✅) (?P<name>.+) turned on"), "{emoji} {name} روشن شد"),
+    (re.compile(r"(?P<emoji>🔌) (?P<name>.+) turned off"), "{emoji} {name} خاموش شد"),
+    (re.compile(r"(?P<emoji>❌) (?P<name>.+) is offline"), "{emoji} {name} آفلاین است"),
+    (re.compile(r"(?P<emoji>❌) (?P<name>.+) is off\. Turn it on first"),
+     "{emoji} {name} خاموش است. اول آن را روشن کنید"),
+    (re.compile(r"(?P<emoji>💡) (?P<name>.+) brightness set to (?P<value>\d+)%"),
+     "{emoji} روشنایی {name} روی {value} درصد تنظیم شد"),
+    (re.compile(r"(?P<emoji>\S+) (?P<name>.+) temperature set to (?P<value>\d+)°C"),
+     "{emoji} دمای {name} روی {value} درجه تنظیم شد"),
+    (re.compile(r"(?P<emoji>📺) (?P<name>.+) channel changed to (?P<value>\d+)"),
+     "{emoji} کانال {name} به {value} تغییر کرد"),
+    (re.compile(r"(?P<emoji>\S+) (?P<name>.+) volume set to (?P<value>\d+)"),
+     "{emoji} صدای {name} روی {value} تنظیم شد"),
+]
+
 
 class PersianService:
     """Persian language detection and translation service"""
@@ -75,21 +102,19 @@ class PersianService:
 
     def is_persian(self, text: str) -> bool:
         """Detect if text contains Persian"""
-        if not text or not text.strip():
+        # isascii() is O(1) for pure-ASCII str objects, so English commands skip the scan entirely
+        if not text or text.isascii() or not text.strip():
+            return False
+
+        # No Persian-script character at all: neither the ratio test nor the
+        # indicator words (all Persian script) can match
+        persian_chars = _PERSIAN_CHAR_RE.findall(text)
+        if not persian_chars:
             return False
 
         # Check for Persian characters
-        persian_char_count = 0
-        total_chars = 0
-
-        for char in text:
-            if char.isalpha():
-                total_chars += 1
-                char_code = ord(char)
-                for start, end in self.persian_ranges:
-                    if start <= char_code <= end:
-                        persian_char_count += 1
-                        break
+        persian_char_count = sum(1 for char in persian_chars if char.isalpha())
+        total_chars = sum(1 for char in text if char.isalpha())
 
         # If more than 30% Persian characters, consider it Persian
         if total_chars > 0 and (persian_char_count / total_chars) > 0.3:
@@ -103,9 +128,11 @@ class PersianService:
 
         return False
 
-    def translate_to_english(self, persian_text: str) -> str:
-        """Translate Persian text to English"""
-        if not self.is_persian(persian_text):
+    def translate_to_english(self, persian_text: str, is_persian: Optional[bool] = None) -> str:
+        """Translate Persian text to English (pass is_persian if it's already been detected)"""
+        if is_persian is None:
+            is_persian = self.is_persian(persian_text)
+        if not is_persian:
             return persian_text
 
         # Convert Persian digits to English
@@ -156,8 +183,37 @@ class PersianService:
 
     def translate_to_persian(self, english_text: str) -> str:
         """Translate English response to Persian"""
+        templated = self._translate_template(english_text)
+        if templated is not None:
+            logger.info(f"Template translation: '{english_text}' -> '{templated}'")
+            return templated
+
         return self.llm_service.translate_text(english_text, "persian")
 
+    @staticmethod
+    def _translate_template(english_text: str) -> Optional[str]:
+        """Translate a canned device response locally, or None if it isn't one"""
+        text = english_text.strip()
+        for pattern, template in _PERSIAN_TEMPLATES:
+            match = pattern.fullmatch(text)
+            if not match:
+                continue
+
+            # "Living Room TV" -> "تلویزیون پذیرایی"
+            location, _, device_type = match["name"].rpartition(" ")
+            persian_location = _PERSIAN_LOCATIONS.get(location.lower())
+            persian_device = _PERSIAN_DEVICE_TYPES.get(device_type)
+            if persian_location is None or persian_device is None:
+                return None
+
+            fields = match.groupdict()
+            fields["name"] = f"{persian_device} {persian_location}"
+            if fields.get("value") is not None:
+                fields["value"] = fields["value"].translate(_PERSIAN_DIGITS)
+            return template.format(**fields)
+
+        return None
+
     def process_command(self, command: str) -> Tuple[str, bool]:
         """
         Process command and return (translated_command, is_persian)
@@ -166,7 +222,7 @@ class PersianService:
             Tuple of (processed_command, was_persian)
         """
         if self.is_persian(command):
-            english_command = self.translate_to_english(command)
+            english_command = self.translate_to_english(command, is_persian=True)
             return english_command, True
         else:
             return command, False
@@ -9,8 +9,9 @@ logger = logging.getLogger(__name__)
 class WeatherService:
     """Weather information service"""
 
-    def __init__(self):
-        """Initialize weather service"""
+    def __init__(self, session: Optional[requests.Session] = None):
+        """Initialize weather service (pass a shared session to reuse pooled connections)"""
+        self.session = session or requests.Session()
         self.api_key = my_config.weather_api_key
         self.api_url = "http://api.openweathermap.org/data/2.5/weather"
 
@@ -34,7 +35,7 @@ class WeatherService:
                 "units": "metric"
             }
 
-            response = requests.get(self.api_url, params=params, timeout=30)
+            response = self.session.get(self.api_url, params=params, timeout=30)
 
             if response.status_code == 200:
                 data = response.json()